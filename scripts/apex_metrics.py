@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete metric definitions
+Shared description of the seven Apex events and how their raw values compare
+
+The results page stores event values as display strings ("4.52", "55'6\"",
+"32\"", "6:12") while the record holders page uses the same formats. Every
+stage that needs to order or aggregate those values goes through here so the
+parsing rules live in one place.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+# Column name in apex_event_results -> how the event is scored
+METRICS: List[Dict[str, Any]] = [
+    {'field': 'fast_forty', 'event_name': 'Fast Forty', 'category': 'Speed', 'unit': 'seconds', 'higher_is_better': False},
+    {'field': 'max_toss', 'event_name': 'Max Toss', 'category': 'Power', 'unit': 'feet_inches', 'higher_is_better': True},
+    {'field': 'the_vertical', 'event_name': 'The Vertical', 'category': 'Power', 'unit': 'inches', 'higher_is_better': True},
+    {'field': 'the_broad', 'event_name': 'The Broad', 'category': 'Power', 'unit': 'feet_inches', 'higher_is_better': True},
+    {'field': 'the_push', 'event_name': 'The Push', 'category': 'Strength', 'unit': 'reps', 'higher_is_better': True},
+    {'field': 'the_pull', 'event_name': 'The Pull', 'category': 'Strength', 'unit': 'reps', 'higher_is_better': True},
+    {'field': 'the_mile', 'event_name': 'The Mile', 'category': 'Endurance', 'unit': 'minutes_seconds', 'higher_is_better': False},
+]
+
+METRICS_BY_FIELD: Dict[str, Dict[str, Any]] = {m['field']: m for m in METRICS}
+METRICS_BY_EVENT: Dict[str, Dict[str, Any]] = {m['event_name'].lower(): m for m in METRICS}
+
+# Overall and category scores are plain numbers where higher is always better
+SCORE_FIELDS: List[str] = ['apex_score', 'speed_score', 'power_score', 'strength_score', 'endurance_score']
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _first_number(text: str) -> Optional[float]:
+    """Return the first number found in a string"""
+    match = _NUMBER.search(text)
+    return float(match.group(0)) if match else None
+
+
+def parse_metric_value(unit: str, raw: Any) -> Optional[float]:
+    """Convert a display value to a comparable number (seconds, inches or reps)
+
+    Returns None for missing or unparseable values so callers can skip them.
+    """
+    if raw is None or isinstance(raw, bool):
+        return None
+    if isinstance(raw, (int, float)):
+        return float(raw) if raw > 0 else None
+
+    text = str(raw).strip()
+    if not text or text in ('—', '-', 'N/A'):
+        return None
+
+    if unit == 'feet_inches':
+        # 55'6" -> 666 inches; a bare number is treated as feet
+        parts = re.findall(r'\d+(?:\.\d+)?', text)
+        if not parts:
+            return None
+        if "'" not in text and '"' in text:
+            value = float(parts[0])
+        else:
+            value = float(parts[0]) * 12 + (float(parts[1]) if len(parts) > 1 else 0.0)
+    elif unit == 'minutes_seconds':
+        # 6:12 -> 372 seconds; a bare number is treated as seconds
+        if ':' in text:
+            minutes, _, seconds = text.partition(':')
+            mins = _first_number(minutes)
+            secs = _first_number(seconds)
+            if mins is None or secs is None:
+                return None
+            value = mins * 60 + secs
+        else:
+            value = _first_number(text)
+    else:
+        value = _first_number(text)
+
+    return value if value and value > 0 else None
+
+
+def parse_field(field: str, raw: Any) -> Optional[float]:
+    """Parse a raw value for an apex_event_results metric or score column"""
+    metric = METRICS_BY_FIELD.get(field)
+    if metric is None:
+        return parse_metric_value('number', raw)
+    return parse_metric_value(metric['unit'], raw)
+
+
+def is_better(field: str, candidate: float, current: Optional[float]) -> bool:
+    """Return True if candidate strictly beats current for the given metric"""
+    if current is None:
+        return True
+    metric = METRICS_BY_FIELD.get(field)
+    if metric is None or metric['higher_is_better']:
+        return candidate > current
+    return candidate < current
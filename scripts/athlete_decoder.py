@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete typed results decoder
+Decodes, validates and converts MEN/WOMEN athlete records in a single pass
+
+With msgspec installed, a whole gender array is decoded straight into typed
+Structs, so validation and conversion happen inside the JSON parser. Only
+when that fails is the array split into raw per-athlete slices, so the one
+malformed athlete is quarantined without losing the rest of the event.
+Without msgspec the same rules are applied to dicts from orjson (or the
+standard json module).
+
+Both backends accept the same records:
+
+- name: a string (required)
+- rank: null, or an integer; integral floats and numeric strings are coerced
+- apexScore: null, or a finite number; numeric strings are coerced
+- metric and category values: null, a number or a display string
+- instagram: null or a string
+
+Booleans are rejected everywhere, even though JSON parsers treat them as
+numbers.
+"""
+
+import json
+import logging
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Placeholder the site uses for athletes without an Instagram handle
+INSTAGRAM_PLACEHOLDER = '@handle'
+
+# data.js key -> apex_event_results column, for values stored as-is
+PASSTHROUGH_FIELDS = {
+    'speedScore': 'speed_score',
+    'powerScore': 'power_score',
+    'strengthScore': 'strength_score',
+    'enduranceScore': 'endurance_score',
+    'fastForty': 'fast_forty',
+    'maxToss': 'max_toss',
+    'theVert': 'the_vertical',
+    'theBroad': 'the_broad',
+    'thePush': 'the_push',
+    'thePull': 'the_pull',
+    'theMile': 'the_mile',
+}
+
+# JSON number syntax, plus the nan/inf spellings msgspec also accepts in strings
+_NUMERIC_STRING = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|[+-]?(?i:nan|inf|infinity)')
+
+# Exact types a passthrough value may have; bool subclasses int, so it is not listed
+_VALUE_TYPES = (type(None), int, float, str)
+
+# Float ranks outside a signed 64-bit integer are rejected, as msgspec does
+_INT64_LIMIT = 2 ** 63
+
+# Reps stay integers, times and distances arrive as numbers or display strings
+Value = Union[int, float, str, None]
+
+if msgspec is not None:
+    class AthleteRecord(msgspec.Struct):
+        """One athlete entry in the MEN/WOMEN arrays of data.js"""
+        name: str
+        rank: Optional[int] = None
+        apexScore: Optional[float] = None
+        speedScore: Value = None
+        powerScore: Value = None
+        strengthScore: Value = None
+        enduranceScore: Value = None
+        fastForty: Value = None
+        maxToss: Value = None
+        theVert: Value = None
+        theBroad: Value = None
+        thePush: Value = None
+        thePull: Value = None
+        theMile: Value = None
+        instagram: Optional[str] = None
+
+    # strict=False lets numeric strings like "812" decode into numeric fields
+    _array_decoder = msgspec.json.Decoder(List[AthleteRecord], strict=False)
+    _record_decoder = msgspec.json.Decoder(AthleteRecord, strict=False)
+    _raw_array_decoder = msgspec.json.Decoder(List[msgspec.Raw])
+
+
+def _numeric_string(text: str) -> Optional[float]:
+    """Parse a numeric string the way msgspec does in lax mode, else None"""
+    if _NUMERIC_STRING.fullmatch(text):
+        return float(text)
+    return None
+
+
+def _coerce_rank(value: Any) -> Tuple[Optional[int], Optional[str]]:
+    """(rank, None) if value is an acceptable rank, else (None, reason)"""
+    if type(value) is int or value is None:
+        return value, None
+    number = _numeric_string(value) if isinstance(value, str) else value
+    if isinstance(number, float) and number.is_integer() and abs(number) < _INT64_LIMIT:
+        return int(number), None
+    return None, f"Expected `int | null`, got `{type(value).__name__}` - at `$.rank`"
+
+
+def _coerce_score(value: Any) -> Tuple[Optional[float], Optional[str]]:
+    """(apex score, None) if value is an acceptable finite score, else (None, reason)"""
+    if type(value) is float:
+        number = value
+    elif value is None:
+        return None, None
+    elif type(value) is int:
+        number = float(value)
+    elif isinstance(value, str):
+        number = _numeric_string(value)
+    else:
+        number = None
+    if number is None:
+        return None, f"Expected `float | null`, got `{type(value).__name__}` - at `$.apexScore`"
+    if not math.isfinite(number):
+        return None, f"Expected a finite `$.apexScore`, got {number}"
+    return number, None
+
+
+class AthleteDecoder:
+    """Turns a MEN/WOMEN JSON array into apex_event_results rows"""
+
+    def __init__(self, quarantine_path: Optional[str] = None):
+        """Collect malformed athletes for the quarantine file at quarantine_path"""
+        self.quarantine_path = quarantine_path
+        self.quarantined: List[Dict] = []
+
+    def decode(self, array_text: str, event_name: str, event_date: str, gender: str) -> List[Dict]:
+        """Decode one gender's array; malformed athletes are quarantined, not raised
+
+        Athletes without a positive apex score are skipped, as before.
+        """
+        if msgspec is not None:
+            return self._decode_typed(array_text, event_name, event_date, gender)
+        return self._decode_fallback(array_text, event_name, event_date, gender)
+
+    def _decode_typed(self, array_text: str, event_name: str, event_date: str, gender: str) -> List[Dict]:
+        """Decode with msgspec Structs, the whole array at once when it is valid"""
+        try:
+            athletes = _array_decoder.decode(array_text)
+        except msgspec.ValidationError:
+            athletes = self._decode_slices(array_text, event_name, gender)
+        except msgspec.DecodeError as e:
+            logger.error(f"Failed to parse {gender} array for {event_name}: {e}")
+            return []
+
+        rows = []
+        for athlete in athletes:
+            apex_score = athlete.apexScore
+            if apex_score is not None and not math.isfinite(apex_score):
+                self._quarantine(event_name, gender, f"Expected a finite `$.apexScore`, got {apex_score}",
+                                 msgspec.structs.asdict(athlete))
+                continue
+            if apex_score and apex_score > 0:  # Skip athletes with 0 scores
+                instagram = athlete.instagram
+                rows.append({
+                    'event_name': event_name,
+                    'date': event_date,
+                    'athlete_rank': athlete.rank,
+                    'athlete_name': athlete.name,
+                    'apex_score': apex_score,
+                    'gender': gender,
+                    'speed_score': athlete.speedScore,
+                    'power_score': athlete.powerScore,
+                    'strength_score': athlete.strengthScore,
+                    'endurance_score': athlete.enduranceScore,
+                    'fast_forty': athlete.fastForty,
+                    'max_toss': athlete.maxToss,
+                    'the_vertical': athlete.theVert,
+                    'the_broad': athlete.theBroad,
+                    'the_push': athlete.thePush,
+                    'the_pull': athlete.thePull,
+                    'the_mile': athlete.theMile,
+                    'instagram_handle': instagram if instagram and instagram != INSTAGRAM_PLACEHOLDER else None,
+                })
+        return rows
+
+    def _decode_slices(self, array_text: str, event_name: str, gender: str) -> List:
+        """Decode athletes one raw slice at a time, quarantining the ones that fail"""
+        athletes = []
+        for raw in _raw_array_decoder.decode(array_text):
+            try:
+                athletes.append(_record_decoder.decode(raw))
+            except (msgspec.ValidationError, msgspec.DecodeError) as e:
+                self._quarantine(event_name, gender, str(e), bytes(raw).decode('utf-8', 'replace'))
+        return athletes
+
+    def _decode_fallback(self, array_text: str, event_name: str, event_date: str, gender: str) -> List[Dict]:
+        """Decode with a plain JSON parser and validate each dict"""
+        try:
+            athletes = _loads(array_text)
+        except ValueError as e:
+            logger.error(f"Failed to parse {gender} array for {event_name}: {e}")
+            return []
+        if not isinstance(athletes, list):
+            logger.error(f"Expected a {gender} array for {event_name}, got {type(athletes).__name__}")
+            return []
+
+        rows = []
+        for athlete in athletes:
+            reason, row = self._to_row(athlete, event_name, event_date, gender)
+            if reason:
+                self._quarantine(event_name, gender, reason, athlete)
+            elif row['apex_score'] and row['apex_score'] > 0:  # Skip athletes with 0 scores
+                rows.append(row)
+        return rows
+
+    def _to_row(self, athlete: Any, event_name: str, event_date: str,
+                gender: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Apply the AthleteRecord rules to a dict: (reason it is unusable, None) or (None, row)"""
+        if type(athlete) is not dict:
+            return f"Expected `object`, got `{type(athlete).__name__}`", None
+        get = athlete.get
+        name = get('name')
+        if type(name) is not str:
+            return ("Object missing required field `name`" if 'name' not in athlete
+                    else "Expected `str` for `$.name`"), None
+
+        rank, reason = _coerce_rank(get('rank'))
+        if reason:
+            return reason, None
+        apex_score, reason = _coerce_score(get('apexScore'))
+        if reason:
+            return reason, None
+
+        row = {
+            'event_name': event_name,
+            'date': event_date,
+            'athlete_rank': rank,
+            'athlete_name': name,
+            'apex_score': apex_score,
+            'gender': gender,
+        }
+        for key, column in PASSTHROUGH_FIELDS.items():
+            value = get(key)
+            if type(value) not in _VALUE_TYPES:
+                return f"Expected `int | float | str | null` - at `$.{key}`", None
+            row[column] = value
+        instagram = get('instagram')
+        if instagram is not None and type(instagram) is not str:
+            return "Expected `str | null` - at `$.instagram`", None
+        row['instagram_handle'] = instagram if instagram and instagram != INSTAGRAM_PLACEHOLDER else None
+        return None, row
+
+    def _quarantine(self, event_name: str, gender: str, reason: str, raw: Any):
+        """Set a malformed athlete aside with the reason it was rejected"""
+        logger.warning(f"Quarantined {gender} athlete in {event_name}: {reason}")
+        self.quarantined.append({
+            'event_name': event_name,
+            'gender': gender,
+            'reason': reason,
+            'raw': raw,
+            'quarantined_at': datetime.now().isoformat(timespec='seconds')
+        })
+
+    def flush_quarantine(self) -> int:
+        """Append quarantined athletes to the quarantine file as JSON Lines"""
+        if not self.quarantined:
+            return 0
+
+        # Swap the buffer out first so entries added meanwhile wait for the next flush
+        entries, self.quarantined = self.quarantined, []
+        if self.quarantine_path:
+            with open(self.quarantine_path, 'a') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            logger.warning(f"Wrote {len(entries)} quarantined athlete(s) to {self.quarantine_path}")
+        return len(entries)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete poison-row isolation
+Bisects a rejected insert batch until only the offending rows are left out
+
+When PostgREST rejects a batch because of one bad row (constraint or type
+violation), the whole batch is lost. insert_isolating splits a rejected batch
+in half and retries each half, repeating until the rejected rows are found.
+Those go to a dead-letter file with the server's error; every other row is
+committed. k bad rows in a batch of n cost O(k log n) extra requests.
+
+Only row-level errors are bisected: SQLSTATE classes 22 (data exception) and
+23 (integrity constraint violation), which PostgREST reports in the "code"
+of its error body. Anything else (a 5xx, a network failure, a missing column
+or permission error) says nothing about individual rows, and would fail
+every half alike, so the batch is reported as failed instead.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# post(rows) -> (inserted rows, None) on success or (None, {'status', 'code', 'message'}) on failure
+PostBatch = Callable[[List[Dict]], Tuple[Optional[List[Dict]], Optional[Dict]]]
+
+# SQLSTATE classes that blame the rows themselves
+ROW_ERROR_CLASSES = ('22', '23')
+
+
+class BatchInsertError(RuntimeError):
+    """A batch failed for a reason other than its rows; inserted holds what was committed first"""
+
+    def __init__(self, message: str, inserted: List[Dict], requests_made: int):
+        super().__init__(message)
+        self.inserted = inserted
+        self.requests_made = requests_made
+
+
+def request_error(e) -> Dict:
+    """The failure of a requests exception as {'status', 'code', 'message'}
+
+    Keeps the server's verdict so callers can tell bad rows from outages.
+    """
+    response = e.response
+    if response is None:
+        return {'status': None, 'code': None, 'message': str(e)}
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    return {
+        'status': response.status_code,
+        'code': body.get('code') if isinstance(body, dict) else None,
+        'message': response.text,
+    }
+
+
+def is_row_error(error: Dict) -> bool:
+    """True when the server rejected the data itself rather than failing"""
+    code = error.get('code')
+    return isinstance(code, str) and code[:2] in ROW_ERROR_CLASSES
+
+
+class DeadLetterFile:
+    """Append-only JSON Lines file of rows the server refused"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.count = 0
+
+    def write(self, table: str, row: Dict, error: Dict):
+        self.count += 1
+        logger.error(f"Dead-lettered row for {table}: {error.get('message')}")
+        if not self.path:
+            return
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({
+                'table': table,
+                'status': error.get('status'),
+                'code': error.get('code'),
+                'error': error.get('message'),
+                'row': row,
+                'failed_at': datetime.now().isoformat(timespec='seconds')
+            }, ensure_ascii=False, default=str) + '\n')
+
+
+def insert_isolating(post: PostBatch, rows: List[Dict], table: str, dead_letter: DeadLetterFile) -> Tuple[List[Dict], int]:
+    """Insert rows, bisecting rejected batches; return (inserted rows, requests made)
+
+    Raises BatchInsertError if a batch fails for a reason other than its
+    rows; the rows committed before that are on the exception.
+    """
+    inserted: List[Dict] = []
+    requests_made = 0
+    # Explicit stack instead of recursion; halves are processed in order
+    pending = [rows]
+
+    while pending:
+        batch = pending.pop()
+        if not batch:
+            continue
+
+        response, error = post(batch)
+        requests_made += 1
+
+        if error is None:
+            inserted.extend(response or [])
+            continue
+
+        if not is_row_error(error):
+            raise BatchInsertError(f"Insert into {table} failed ({error.get('status')}): {error.get('message')}",
+                                   inserted, requests_made)
+
+        if len(batch) == 1:
+            dead_letter.write(table, batch[0], error)
+            continue
+
+        middle = len(batch) // 2
+        if batch is rows:
+            logger.warning(f"Batch of {len(rows)} rejected by {table} ({error.get('code')}); isolating bad rows")
+        pending.append(batch[middle:])
+        pending.append(batch[:middle])
+
+    return inserted, requests_made
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete scaling harness
+Runs the scraper pipeline against synthetic sites of growing size
+
+For each size a synthetic site is generated (see synthetic_data.py) and
+served from a local HTTP server; the scrapers are pointed at it by overriding
+their BASE_URL / IFRAME_URL. Each pipeline stage is timed, then run again
+under tracemalloc for its peak memory. A log-log fit of time against input
+size flags stages that grow faster than linearly.
+
+Usage:
+    python benchmarks/scaling_harness.py
+    python benchmarks/scaling_harness.py --sizes 1000,5000,20000 --stages extract,scrape_event,jsonl
+    python benchmarks/scaling_harness.py --csv scaling.csv --plot scaling.png
+"""
+
+import argparse
+import contextlib
+import functools
+import http.server
+import io
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import generate  # noqa: E402
+
+# Stages slower than n^SUPERLINEAR_EXPONENT are reported
+SUPERLINEAR_EXPONENT = 1.25
+
+
+@contextlib.contextmanager
+def serve_directory(path: str):
+    """Serve a directory over HTTP on a free localhost port"""
+    handler = functools.partial(_QuietHandler, directory=path)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Pipeline:
+    """The scraper stages under test, bound to one synthetic site"""
+
+    def __init__(self, base_url: str):
+        from scrape_apex_results import ApexResultsScraper
+        from scrape_record_holders import ApexRecordHoldersScraper
+
+        # Point both scrapers (including the dry-run record cross-check) at the local site
+        ApexResultsScraper.BASE_URL = base_url
+        ApexResultsScraper.IFRAME_URL = f"{base_url}/apex_pages/apex_results_page/index.html"
+        ApexResultsScraper.REQUEST_DELAY = 0
+        ApexRecordHoldersScraper.IFRAME_URL = f"{base_url}/apex_pages/apex_record_holders_page/index.html"
+
+        self.results_scraper_class = ApexResultsScraper
+        self.records_scraper_class = ApexRecordHoldersScraper
+        self.data_url = f"{base_url}/apex_pages/apex_results_page/data.js"
+
+        # Inputs for the stages that start from already-parsed data
+        scraper = self._results_scraper()
+        self.js_content, _ = scraper.fetcher.get_text(self.data_url)
+        self.results = scraper.scrape_event_results(self.data_url, 'Synthetic Event', 'Jan 06, 2024')
+
+    def _results_scraper(self, **kwargs):
+        return self.results_scraper_class(dry_run=True, quarantine_path=None, **kwargs)
+
+    def stages(self) -> Dict[str, Callable[[], None]]:
+        """Stage name -> zero-argument callable"""
+        return {
+            'extract': self.extract,
+            'scrape_event': self.scrape_event,
+            'pretty_print': self.pretty_print,
+            'jsonl': functools.partial(self.write_rows, 'jsonl'),
+            'csv': functools.partial(self.write_rows, 'csv'),
+            'record_book': self.record_book,
+            'percentiles': self.percentiles,
+            'records_scrape': self.records_scrape,
+            'full_run': self.full_run,
+        }
+
+    def extract(self):
+        scraper = self._results_scraper()
+        for gender, prefix in (('Men', 'const MEN = '), ('Women', 'const WOMEN = ')):
+            array_text = scraper._extract_array_text(self.js_content, prefix)
+            scraper.decoder.decode(array_text, 'Synthetic Event', '2024-01-06', gender)
+
+    def scrape_event(self):
+        # A fresh scraper has no cached validators, so this includes the full download
+        self._results_scraper().scrape_event_results(self.data_url, 'Synthetic Event', 'Jan 06, 2024')
+
+    def pretty_print(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self._results_scraper()._print_dry_run_results(self.results)
+
+    def write_rows(self, output: str):
+        from row_output import make_row_writer
+        writer = make_row_writer(output, self.results_scraper_class.RESULT_COLUMNS, stream=_NullStream())
+        for row in self.results:
+            writer.write(row)
+        writer.close()
+
+    def record_book(self):
+        from record_book import RecordBook
+        RecordBook().offer_all(self.results)
+
+    def percentiles(self):
+        from percentile_ranks import PercentileIndex
+        index = PercentileIndex()
+        index.add_rows(self.results)
+        index.changed_rows()
+
+    def records_scrape(self):
+        self.records_scraper_class(dry_run=True).scrape_records()
+
+    def full_run(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self._results_scraper().run()
+
+
+class _NullStream(io.TextIOBase):
+    """Discards writes while still paying for string formatting"""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def measure(fn: Callable[[], None], repeat: int) -> Tuple[float, int]:
+    """Best wall time over repeat runs, then peak traced memory of one more run"""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def scaling_exponent(sizes: List[int], values: List[float]) -> float:
+    """Least-squares slope of log(value) against log(size)"""
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if s > 0 and v > 0]
+    if len(points) < 2:
+        return float('nan')
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return float('nan')
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def plot(rows: List[Dict], stages: List[str], path: str) -> bool:
+    """Plot time and peak memory against size on log-log axes"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        logging.warning("matplotlib is not installed; skipping plot")
+        return False
+
+    fig, (ax_time, ax_mem) = plt.subplots(1, 2, figsize=(12, 5))
+    for stage in stages:
+        points = [r for r in rows if r['stage'] == stage]
+        sizes = [r['athletes'] for r in points]
+        ax_time.plot(sizes, [r['seconds'] for r in points], marker='o', label=stage)
+        ax_mem.plot(sizes, [r['peak_bytes'] / 1e6 for r in points], marker='o', label=stage)
+    for ax, label in ((ax_time, 'seconds'), (ax_mem, 'peak MB')):
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('athletes')
+        ax.set_ylabel(label)
+        ax.grid(True, which='both', alpha=0.3)
+    ax_time.legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(path)
+    return True
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Measure how the scraper pipeline scales with input size')
+    parser.add_argument('--sizes', default='1000,2000,4000,8000',
+                        help='Comma-separated total athlete counts (default: %(default)s)')
+    parser.add_argument('--events', type=int, default=5,
+                        help='Event cards on every synthetic site (default: %(default)s)')
+    parser.add_argument('--stages', help='Comma-separated subset of stages to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage; the best is kept')
+    parser.add_argument('--csv', metavar='PATH', help='Write raw measurements as CSV')
+    parser.add_argument('--plot', metavar='PATH', help='Write a time/memory plot (requires matplotlib)')
+    args = parser.parse_args()
+
+    # The scrapers log every fetch and event; configuring logging first makes
+    # their own basicConfig a no-op, so only warnings are shown
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    rows = []
+    stage_names = None
+
+    # Every event card reads the same data.js, as on the live site, so the
+    # event count stays fixed; growing it with size would make full_run
+    # scale with events x athletes
+    events = args.events
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as site_dir:
+            payload = sum(generate(site_dir, size, events).values())
+            with serve_directory(site_dir) as base_url:
+                stages = Pipeline(base_url).stages()
+                stage_names = args.stages.split(',') if args.stages else list(stages)
+                for name in stage_names:
+                    seconds, peak = measure(stages[name], args.repeat)
+                    rows.append({'stage': name, 'athletes': size, 'events': events, 'payload_bytes': payload,
+                                 'seconds': seconds, 'peak_bytes': peak})
+                    print(f"{size:>8} athletes {events:>5} events  {name:<15} "
+                          f"{seconds * 1000:>10.1f} ms  {peak / 1e6:>8.1f} MB peak", flush=True)
+
+    print("\nScaling exponents (1.0 = linear)")
+    superlinear = []
+    for name in stage_names or []:
+        points = [r for r in rows if r['stage'] == name]
+        time_exp = scaling_exponent([r['athletes'] for r in points], [r['seconds'] for r in points])
+        mem_exp = scaling_exponent([r['athletes'] for r in points], [r['peak_bytes'] for r in points])
+        flag = ''
+        if time_exp > SUPERLINEAR_EXPONENT or mem_exp > SUPERLINEAR_EXPONENT:
+            flag = '  <-- super-linear'
+            superlinear.append(name)
+        print(f"  {name:<15} time n^{time_exp:.2f}  memory n^{mem_exp:.2f}{flag}")
+
+    if args.csv:
+        import csv
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nWrote {args.csv}")
+
+    if args.plot and plot(rows, stage_names or [], args.plot):
+        print(f"Wrote {args.plot}")
+
+    return 1 if superlinear else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete startup benchmark
+Measures interpreter-to-first-request time for the scrapers
+
+Every measurement is a fresh interpreter, so module import costs are paid
+each time, as they are on a scheduled CI run:
+
+- bare: python -c pass, the floor everything else is compared against
+- import: importing scrape_apex_results / scrape_record_holders
+- help: running each script with --help
+- first_request: process start until a local HTTP server sees the first
+  request from ApexResultsScraper.fetch_page
+
+Targets are the source tree (dependencies from site-packages) and, if one is
+given or built, the zipapp bundle from build_bundle.py. The slowest top-level
+imports of the source tree are listed from python -X importtime.
+
+Usage:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --build --repeat 10 --csv startup.csv
+    python benchmarks/startup_time.py --bundle dist/apex_scrapers.pyz
+"""
+
+import argparse
+import contextlib
+import http.server
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUNDLE = os.path.join(SCRIPTS_DIR, 'dist', 'apex_scrapers.pyz')
+
+FIRST_REQUEST_CODE = '''
+import sys
+sys.path.insert(0, {path!r})
+import scrape_apex_results
+scrape_apex_results.ApexResultsScraper(dry_run=True, quarantine_path=None).fetch_page({url!r}, retries=1)
+'''
+
+
+@contextlib.contextmanager
+def request_clock():
+    """Local HTTP server that records the wall time of each request it receives"""
+    arrivals: List[float] = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            arrivals.append(time.time())
+            body = b'<html><body></body></html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/index.html", arrivals
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_python(args: List[str], cwd: str) -> Tuple[float, Optional[str]]:
+    """Wall time of one interpreter run, and its error output if it failed"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, cwd=cwd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        return elapsed, (result.stderr.strip().splitlines() or ['failed'])[-1]
+    return elapsed, None
+
+
+def measure(name: str, fn, repeat: int) -> Dict:
+    """Median seconds of repeat runs of fn() -> (seconds, error)"""
+    times = []
+    for _ in range(repeat):
+        seconds, error = fn()
+        if error:
+            return {'measurement': name, 'seconds': None, 'error': error}
+        times.append(seconds)
+    return {'measurement': name, 'seconds': statistics.median(times), 'error': None}
+
+
+def first_request(path: str, url: str, arrivals: List[float]) -> Tuple[float, Optional[str]]:
+    """Seconds from spawning the scraper to its first request reaching the server"""
+    arrivals.clear()
+    start = time.time()
+    _, error = run_python(['-c', FIRST_REQUEST_CODE.format(path=path, url=url)], cwd=tempfile.gettempdir())
+    if error or not arrivals:
+        return 0.0, error or 'no request received'
+    return arrivals[0] - start, None
+
+
+def measure_target(label: str, path: str, url: str, arrivals: List[float], repeat: int) -> List[Dict]:
+    """All measurements for the scripts importable from path (a directory or a .pyz)"""
+    bundle = path.endswith('.pyz')
+    rows = []
+    for module in ('scrape_apex_results', 'scrape_record_holders'):
+        code = f"import sys; sys.path.insert(0, {path!r}); import {module}"
+        rows.append(measure(f"import {module}", lambda: run_python(['-c', code], SCRIPTS_DIR), repeat))
+
+    for module, command in (('scrape_apex_results', 'results'), ('scrape_record_holders', 'records')):
+        args = [path, command, '--help'] if bundle else [f"{module}.py", '--help']
+        rows.append(measure(f"{module} --help", lambda: run_python(args, SCRIPTS_DIR), repeat))
+
+    rows.append(measure('first request', lambda: first_request(path, url, arrivals), repeat))
+    for row in rows:
+        row['target'] = label
+    return rows
+
+
+def slowest_imports(limit: int) -> List[Tuple[int, str]]:
+    """(cumulative microseconds, module) for the slowest top-level imports of the results scraper"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import scrape_apex_results'],
+                            cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        # Nested imports are indented; only count each top-level import once
+        if not module.startswith('  '):
+            imports.append((int(cumulative), module.strip()))
+    return sorted(imports, reverse=True)[:limit]
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Measure scraper startup and time to first request')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the median is kept')
+    parser.add_argument('--bundle', help=f'Zipapp bundle to measure as well (default: {DEFAULT_BUNDLE} if present)')
+    parser.add_argument('--build', action='store_true', help='Build a fresh bundle into a temporary directory first')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list (default: %(default)s)')
+    parser.add_argument('--csv', metavar='PATH', help='Write measurements as CSV')
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        bundle = args.bundle or (DEFAULT_BUNDLE if os.path.exists(DEFAULT_BUNDLE) else None)
+        if args.build:
+            sys.path.insert(0, SCRIPTS_DIR)
+            from build_bundle import build
+            bundle = os.path.join(stack.enter_context(tempfile.TemporaryDirectory()), 'apex_scrapers.pyz')
+            build(bundle)
+
+        url, arrivals = stack.enter_context(request_clock())
+        rows = [dict(measure('python -c pass', lambda: run_python(['-c', 'pass'], SCRIPTS_DIR), args.repeat),
+                     target='bare')]
+        rows += measure_target('source', SCRIPTS_DIR, url, arrivals, args.repeat)
+        if bundle:
+            rows += measure_target('bundle', os.path.abspath(bundle), url, arrivals, args.repeat)
+
+    print(f"{'target':<8} {'measurement':<36} {'median':>10}")
+    for row in rows:
+        value = f"{row['seconds'] * 1000:>8.0f} ms" if row['seconds'] is not None else f"  failed: {row['error']}"
+        print(f"{row['target']:<8} {row['measurement']:<36} {value}")
+
+    top = slowest_imports(args.top)
+    if top:
+        print("\nSlowest top-level imports of scrape_apex_results (source, cumulative)")
+        for microseconds, module in top:
+            print(f"  {microseconds / 1000:>8.1f} ms  {module}")
+
+    if args.csv:
+        import csv
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['target', 'measurement', 'seconds', 'error'])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nWrote {args.csv}")
+
+    return 1 if any(row['error'] for row in rows if row['target'] != 'source') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete synthetic site generator
+Writes realistic results and record holder pages at a chosen size
+
+The output mirrors the live site layout, so the scrapers can be pointed at it
+by serving the directory over HTTP:
+
+    <out>/apex_pages/apex_results_page/index.html        event cards
+    <out>/apex_pages/apex_results_page/data.js           const MEN / const WOMEN
+    <out>/apex_pages/apex_record_holders_page/index.html const RECORDS
+
+Athletes use the same field names and value formats as data.js (fastForty,
+maxToss, theVert, ...). Output is deterministic for a given seed.
+
+Like the live site, every event card leads to the one data.js, so a full
+scrape parses all athletes once per event.
+
+Usage:
+    python benchmarks/synthetic_data.py --athletes 20000 --events 5 --out /tmp/apex_site
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+from typing import Dict, List
+
+FIRST_NAMES = [
+    'Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn', 'Reese',
+    'Cameron', 'Drew', 'Hayden', 'Parker', 'Rowan', 'Sage', 'Skyler', 'Emerson', 'Finley', 'Kendall'
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Moore', 'Jackson', 'Martin', 'Lee'
+]
+CITIES = ['Austin, TX', 'Denver, CO', 'Miami, FL', 'Phoenix, AZ', 'Nashville, TN', 'San Diego, CA']
+
+RECORD_EVENTS = [
+    ('speed', 'FAST FORTY'), ('power', 'MAX TOSS'), ('power', 'THE VERTICAL'), ('power', 'THE BROAD'),
+    ('strength', 'THE PUSH'), ('strength', 'THE PULL'), ('endurance', 'THE MILE')
+]
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def _feet_inches(inches: int) -> str:
+    return f"{inches // 12}'{inches % 12}\""
+
+
+def make_athlete(rng: random.Random, serial: int, women: bool) -> Dict:
+    """One athlete entry in data.js format; rank is filled in once the array is sorted"""
+    # A single latent ability keeps the event values and scores correlated
+    ability = rng.random()
+    scale = 0.85 if women else 1.0
+
+    forty = round(_clamp(5.4 - ability * 1.0 + rng.gauss(0, 0.08) + (0.35 if women else 0), 4.2, 6.5), 2)
+    toss = int(_clamp((450 + ability * 450 + rng.gauss(0, 40)) * scale, 300, 950))
+    vert = int(_clamp((15 + ability * 30 + rng.gauss(0, 3)) * scale, 8, 48))
+    broad = int(_clamp((72 + ability * 66 + rng.gauss(0, 6)) * scale, 50, 145))
+    push = int(_clamp(4 + ability * 36 + rng.gauss(0, 4), 0, 60))
+    pull = int(_clamp((4 + ability * 36 + rng.gauss(0, 4)) * scale, 0, 45))
+    mile = int(_clamp(606 - ability * 346 + rng.gauss(0, 20) + (40 if women else 0), 250, 900))
+
+    speed, power, strength, endurance = (
+        int(_clamp(250 * ability + rng.gauss(0, 20), 0, 250)) for _ in range(4)
+    )
+    # The serial keeps names unique, like real athletes' full names
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {serial}"
+
+    return {
+        'rank': None,
+        'name': name,
+        'apexScore': speed + power + strength + endurance,
+        'speedScore': speed,
+        'powerScore': power,
+        'strengthScore': strength,
+        'enduranceScore': endurance,
+        'fastForty': f"{forty:.2f}",
+        'maxToss': _feet_inches(toss),
+        'theVert': f"{vert}\"",
+        'theBroad': _feet_inches(broad),
+        'thePush': push,
+        'thePull': pull,
+        'theMile': f"{mile // 60}:{mile % 60:02d}",
+        'instagram': f"@{name.lower().replace(' ', '_')}" if rng.random() < 0.7 else '@handle'
+    }
+
+
+def make_gender(rng: random.Random, count: int, women: bool) -> List[Dict]:
+    """A ranked MEN or WOMEN array"""
+    athletes = [make_athlete(rng, serial, women) for serial in range(count)]
+    athletes.sort(key=lambda a: a['apexScore'], reverse=True)
+    for rank, athlete in enumerate(athletes, start=1):
+        athlete['rank'] = rank
+    return athletes
+
+
+def make_data_js(men: List[Dict], women: List[Dict]) -> str:
+    """data.js with one JSON object per line, like the live file"""
+    def array(items: List[Dict]) -> str:
+        return '[\n  ' + ',\n  '.join(json.dumps(a) for a in items) + '\n]'
+    return f"const MEN = {array(men)};\n\nconst WOMEN = {array(women)};\n"
+
+
+def make_results_index(events: int, rng: random.Random) -> str:
+    """Results iframe page with one eventCard per event"""
+    start = date(2024, 1, 6)
+    cards = []
+    for i in range(events):
+        day = start + timedelta(days=7 * i)
+        cards.append(
+            f'<a class="eventCard" href="leaderboard.html?event={i}">'
+            f'<div class="eventTitle">Apex Combine {i + 1}</div>'
+            f'<div class="meta">{day.strftime("%b %d, %Y")} • {rng.choice(CITIES)}</div></a>'
+        )
+    return '<html><body><div class="events">\n' + '\n'.join(cards) + '\n</div></body></html>\n'
+
+
+def make_records_index(men: List[Dict], women: List[Dict]) -> str:
+    """Record holders iframe page with a RECORDS array built from the athletes"""
+    keys = {
+        'FAST FORTY': ('fastForty', lambda v: float(v), min),
+        'MAX TOSS': ('maxToss', lambda v: int(v.split("'")[0]) * 12 + int(v.split("'")[1].rstrip('"')), max),
+        'THE VERTICAL': ('theVert', lambda v: int(v.rstrip('"')), max),
+        'THE BROAD': ('theBroad', lambda v: int(v.split("'")[0]) * 12 + int(v.split("'")[1].rstrip('"')), max),
+        'THE PUSH': ('thePush', int, max),
+        'THE PULL': ('thePull', int, max),
+        'THE MILE': ('theMile', lambda v: int(v.split(':')[0]) * 60 + int(v.split(':')[1]), min),
+    }
+
+    def holder(athletes: List[Dict], title: str) -> Dict:
+        if not athletes:
+            return {'name': '', 'value': '', 'ig': '—'}
+        field, parse, pick = keys[title]
+        best = pick(athletes, key=lambda a: parse(a[field]))
+        ig = best['instagram'] if best['instagram'] != '@handle' else '—'
+        return {'name': best['name'], 'value': str(best[field]), 'ig': ig}
+
+    records = [{'cat': cat, 'title': title, 'men': holder(men, title), 'women': holder(women, title)}
+               for cat, title in RECORD_EVENTS]
+    return '<html><body><script>\nconst RECORDS = ' + json.dumps(records, indent=2) + ';\n</script></body></html>\n'
+
+
+def generate(out_dir: str, athletes: int, events: int, seed: int = 7) -> Dict[str, int]:
+    """Write a synthetic site under out_dir; return the payload sizes in bytes"""
+    rng = random.Random(seed)
+    men = make_gender(rng, athletes - athletes // 2, women=False)
+    women = make_gender(rng, athletes // 2, women=True)
+
+    results_dir = os.path.join(out_dir, 'apex_pages', 'apex_results_page')
+    records_dir = os.path.join(out_dir, 'apex_pages', 'apex_record_holders_page')
+    os.makedirs(results_dir, exist_ok=True)
+    os.makedirs(records_dir, exist_ok=True)
+
+    files = {
+        os.path.join(results_dir, 'index.html'): make_results_index(events, rng),
+        os.path.join(results_dir, 'data.js'): make_data_js(men, women),
+        os.path.join(records_dir, 'index.html'): make_records_index(men, women),
+    }
+    sizes = {}
+    for path, content in files.items():
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        sizes[os.path.relpath(path, out_dir)] = len(content.encode('utf-8'))
+    return sizes
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Generate a synthetic Apex results site')
+    parser.add_argument('--athletes', type=int, default=10000, help='Total athletes across MEN and WOMEN')
+    parser.add_argument('--events', type=int, default=5, help='Number of event cards on the results page')
+    parser.add_argument('--seed', type=int, default=7, help='Random seed (default: %(default)s)')
+    parser.add_argument('--out', required=True, help='Directory to write the site into')
+    args = parser.parse_args()
+
+    for path, size in generate(args.out, args.athletes, args.events, args.seed).items():
+        print(f"{path}: {size:,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
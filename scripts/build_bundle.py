@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete scraper bundle
+Builds a single-file zipapp with the scrapers and their vendored dependencies
+
+The bundle runs with a bare Python interpreter, no pip install step:
+
+    python dist/apex_scrapers.pyz results --dry-run
+    python dist/apex_scrapers.pyz records
+    python dist/apex_scrapers.pyz reconcile --report reconcile.json
+
+Pure-Python wheels are vendored into the zip. Compiled extensions cannot be
+imported from a zip file, so COMPILED_REQUIREMENTS are installed for the
+building interpreter and platform into a directory beside the bundle
+(dist/apex_scrapers.libs), which the bundle puts on sys.path. Copy both, and
+cache them per interpreter and platform. Without the directory, or on another
+platform, the scrapers fall back (msgspec -> orjson/json, brotli -> gzip).
+UNUSED_REQUIREMENTS are never vendored.
+
+Modules are precompiled to unchecked-hash .pyc files next to their sources,
+so zipimport loads bytecode directly instead of compiling on every start.
+The bytecode matches the Python that builds the bundle; any other version
+still runs it, just compiling from source.
+
+Usage:
+    python build_bundle.py
+    python build_bundle.py --out /tmp/apex_scrapers.pyz
+"""
+
+import argparse
+import compileall
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipapp
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(SCRIPTS_DIR, 'dist', 'apex_scrapers.pyz')
+
+# Bundle subcommand -> module whose main() it runs
+COMMANDS = {
+    'results': 'scrape_apex_results',
+    'records': 'scrape_record_holders',
+    'reconcile': 'reconcile_results',
+}
+
+# Installed beside the bundle for the building platform
+COMPILED_REQUIREMENTS = {'msgspec', 'brotli'}
+# Listed in requirements.txt but never imported by the scrapers
+UNUSED_REQUIREMENTS = {'lxml'}
+
+MAIN_TEMPLATE = '''\
+import importlib
+import os
+import sys
+
+COMMANDS = __COMMANDS__
+
+# Compiled dependencies live beside the archive: apex_scrapers.pyz -> apex_scrapers.libs
+LIBS = os.path.splitext(os.path.dirname(os.path.abspath(__file__)))[0] + '.libs'
+if os.path.isdir(LIBS):
+    sys.path.insert(1, LIBS)
+
+
+def main():
+    program = os.path.basename(sys.argv[0])
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print(f"usage: {program} {{{'|'.join(COMMANDS)}}} [options]", file=sys.stderr)
+        return 2
+    command = sys.argv.pop(1)
+    # argparse names the program after argv[0]
+    sys.argv[0] = f"{program} {command}"
+    return importlib.import_module(COMMANDS[command]).main()
+
+
+sys.exit(main())
+'''
+
+
+def bundled_requirements(path: str):
+    """(pure-Python, compiled) requirement lines from requirements.txt"""
+    pure, compiled = [], []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            name = line.split('==')[0].split('>=')[0].split('[')[0].strip().lower()
+            if name in COMPILED_REQUIREMENTS:
+                compiled.append(line)
+            elif name not in UNUSED_REQUIREMENTS:
+                pure.append(line)
+    return pure, compiled
+
+
+def vendor(requirements, target: str, pure: bool = True):
+    """Install wheels for requirements (and their dependencies) into target
+
+    Pure-Python wheels are resolved for any platform; the others for the
+    interpreter and platform running the build.
+    """
+    platform = [
+        '--platform', 'any', '--implementation', 'py',
+        '--python-version', f"{sys.version_info.major}.{sys.version_info.minor}",
+    ] if pure else []
+    subprocess.run([
+        sys.executable, '-m', 'pip', 'install',
+        '--target', target,
+        '--only-binary=:all:', *platform,
+        '--no-compile', '--disable-pip-version-check', '--quiet',
+        *requirements
+    ], check=True)
+
+    # Console scripts and pip metadata are never imported
+    for name in os.listdir(target):
+        if name == 'bin' or name.endswith('.dist-info'):
+            shutil.rmtree(os.path.join(target, name))
+
+
+def libs_path(output: str) -> str:
+    """Directory of compiled dependencies that belongs to the bundle at output"""
+    return os.path.splitext(os.path.abspath(output))[0] + '.libs'
+
+
+def build(output: str) -> int:
+    """Build the bundle at output and its compiled dependencies; return the bundle's size in bytes"""
+    pure, compiled = bundled_requirements(os.path.join(SCRIPTS_DIR, 'requirements.txt'))
+    with tempfile.TemporaryDirectory() as staging:
+        vendor(pure, staging)
+
+        for name in sorted(os.listdir(SCRIPTS_DIR)):
+            if name.endswith('.py') and name != os.path.basename(__file__):
+                shutil.copy2(os.path.join(SCRIPTS_DIR, name), staging)
+
+        with open(os.path.join(staging, '__main__.py'), 'w') as f:
+            f.write(MAIN_TEMPLATE.replace('__COMMANDS__', repr(COMMANDS)))
+
+        # Legacy layout (module.pyc beside module.py) is what zipimport looks for
+        compileall.compile_dir(staging, quiet=1, legacy=True,
+                               invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        for root, dirs, _ in os.walk(staging):
+            if '__pycache__' in dirs:
+                shutil.rmtree(os.path.join(root, '__pycache__'))
+                dirs.remove('__pycache__')
+
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        zipapp.create_archive(staging, output, interpreter='/usr/bin/env python3', compressed=True)
+
+    libs = libs_path(output)
+    shutil.rmtree(libs, ignore_errors=True)
+    if compiled:
+        vendor(compiled, libs, pure=False)
+        compileall.compile_dir(libs, quiet=1)
+
+    return os.path.getsize(output)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Build a self-contained zipapp of the scrapers')
+    parser.add_argument('--out', default=DEFAULT_OUTPUT, help='Bundle path (default: %(default)s)')
+    args = parser.parse_args()
+
+    size = build(args.out)
+    print(f"Wrote {args.out} ({size / 1e6:.1f} MB) and {libs_path(args.out)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete command-line helpers
+Environment loading and argument types shared by the scraper entry points
+"""
+
+import argparse
+import os
+
+
+def load_env():
+    """Load the .env file beside the scripts, else the working directory's
+
+    Inside the bundle, __file__ is a path in the zip, so a .env next to the
+    bundle is picked up from the working directory instead.
+    """
+    from dotenv import find_dotenv, load_dotenv
+
+    load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
+    load_dotenv(find_dotenv(usecwd=True))
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts and intervals that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got '{value}'")
+    return number
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete conditional fetcher
+Keeps one connection pool to the site and only re-downloads what changed
+
+Every GET remembers the ETag / Last-Modified validators and a digest of the
+body. Later requests send If-None-Match / If-Modified-Since, so an idle poll
+costs one small 304 response. Servers that ignore validators still send the
+full body, but an unchanged digest is reported as unchanged all the same.
+
+Bodies are kept as raw bytes. HTML goes to BeautifulSoup undecoded so it can
+honour the page's <meta charset>; requests would otherwise decode any text/*
+response without a charset header as ISO-8859-1. get_text decodes with the
+header's charset, else UTF-8.
+"""
+
+import hashlib
+import logging
+from typing import Dict, Tuple
+
+from http_compression import ACCEPT_ENCODING, log_transfer
+from lazy_imports import lazy_import
+
+requests = lazy_import('requests')
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+
+class ConditionalFetcher:
+    """Origin HTTP client that caches bodies and validators per URL"""
+
+    def __init__(self, timeout: int = 30):
+        """Open a keep-alive session for the site (never shared with Supabase credentials)"""
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': ACCEPT_ENCODING
+        })
+        self.validators: Dict[str, Dict[str, str]] = {}
+        self.bodies: Dict[str, bytes] = {}
+        self.encodings: Dict[str, str] = {}
+        self.digests: Dict[str, str] = {}
+
+    def get(self, url: str) -> Tuple[bytes, bool]:
+        """Fetch a URL, returning its raw body and whether it changed since the last fetch
+
+        Raises requests.RequestException on failure, like requests.get.
+        """
+        headers = {}
+        if url in self.bodies:
+            headers.update(self.validators.get(url, {}))
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and url in self.bodies:
+            logger.debug(f"Not modified: {url}")
+            return self.bodies[url], False
+
+        response.raise_for_status()
+        log_transfer(response, url)
+
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        self.validators[url] = validators
+
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        changed = self.digests.get(url) != digest
+        self.bodies[url] = body
+        # Only an explicit charset is trusted; requests' ISO-8859-1 default for text/* is not
+        has_charset = 'charset' in response.headers.get('Content-Type', '').lower()
+        self.encodings[url] = response.encoding if has_charset and response.encoding else 'utf-8'
+        self.digests[url] = digest
+
+        if not changed:
+            logger.debug(f"Unchanged body: {url}")
+        return body, changed
+
+    def get_text(self, url: str) -> Tuple[str, bool]:
+        """Like get, but decoded with the response's charset (UTF-8 when it has none)"""
+        body, changed = self.get(url)
+        return body.decode(self.encodings.get(url, 'utf-8'), errors='replace'), changed
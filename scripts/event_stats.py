@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete event statistics
+Streaming per-event distribution summaries for the overall and category scores
+
+Rows are folded in one at a time as they are parsed, so summaries cost
+nothing beyond the scrape itself. Each (event, gender, metric) keeps:
+
+- Welford running mean and variance, plus min and max
+- a fixed-bin histogram over the metric's score range
+- P² quantile sketches (five markers per quantile, constant memory)
+
+Summaries are written to a small table for the app to read:
+
+    create table apex_event_stats (
+        event_name text not null,
+        gender text not null,
+        metric text not null,
+        count integer not null,
+        mean real, stddev real, min real, max real,
+        p10 real, p25 real, p50 real, p75 real, p90 real,
+        bin_start real, bin_width real, histogram jsonb,
+        updated_at timestamptz default now(),
+        primary key (event_name, gender, metric)
+    );
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Metric -> (histogram start, histogram end); scores are out of 1000 overall, 250 per category
+METRIC_RANGES: Dict[str, Tuple[float, float]] = {
+    'apex_score': (0.0, 1000.0),
+    'speed_score': (0.0, 250.0),
+    'power_score': (0.0, 250.0),
+    'strength_score': (0.0, 250.0),
+    'endurance_score': (0.0, 250.0),
+}
+
+HISTOGRAM_BINS = 20
+QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+
+class P2Quantile:
+    """P² streaming estimate of a single quantile (Jain & Chlamtac, 1985)"""
+
+    __slots__ = ('p', 'heights', 'positions', 'desired', 'increments', 'initial')
+
+    def __init__(self, p: float):
+        self.p = p
+        self.initial: List[float] = []
+        self.heights: List[float] = []
+        self.positions: List[int] = []
+        self.desired: List[float] = []
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float):
+        if len(self.initial) < 5:
+            self.initial.append(x)
+            if len(self.initial) == 5:
+                self.heights = sorted(self.initial)
+                self.positions = [0, 1, 2, 3, 4]
+                self.desired = [0.0, 2 * self.p, 4 * self.p, 2 + 2 * self.p, 4.0]
+            return
+
+        q, n = self.heights, self.positions
+        # Find the cell containing x, stretching the extremes if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Nudge the three middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = candidate
+                n[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if len(self.initial) < 5:
+            if not self.initial:
+                return None
+            # Too few points for markers; use the exact nearest-rank quantile
+            ordered = sorted(self.initial)
+            return ordered[min(len(ordered) - 1, max(0, math.ceil(self.p * len(ordered)) - 1))]
+        return self.heights[2]
+
+
+class RunningStats:
+    """Single-pass distribution summary for one (event, gender, metric)"""
+
+    def __init__(self, start: float, end: float, bins: int = HISTOGRAM_BINS):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.bin_start = start
+        self.bin_width = (end - start) / bins
+        self.histogram = [0] * bins
+        self.quantiles = [P2Quantile(p) for p in QUANTILES]
+
+    def add(self, x: float):
+        # Welford's update keeps the variance numerically stable in one pass
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+
+        # Values outside the range land in the first or last bin
+        index = int((x - self.bin_start) // self.bin_width)
+        self.histogram[max(0, min(len(self.histogram) - 1, index))] += 1
+
+        for sketch in self.quantiles:
+            sketch.add(x)
+
+    @property
+    def stddev(self) -> Optional[float]:
+        """Sample standard deviation"""
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def as_row(self) -> Dict:
+        row = {
+            'count': self.count,
+            'mean': round(self.mean, 3) if self.count else None,
+            'stddev': round(self.stddev, 3) if self.stddev is not None else None,
+            'min': self.min,
+            'max': self.max,
+            'bin_start': self.bin_start,
+            'bin_width': self.bin_width,
+            'histogram': list(self.histogram),
+        }
+        for p, sketch in zip(QUANTILES, self.quantiles):
+            value = sketch.value()
+            row[f'p{int(p * 100)}'] = round(value, 3) if value is not None else None
+        return row
+
+
+class EventStatistics:
+    """RunningStats for every (event, gender, metric) seen in a run"""
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, str, str], RunningStats] = {}
+
+    def add(self, result: Dict):
+        """Fold one apex_event_results row into its event's summaries"""
+        for metric, (start, end) in METRIC_RANGES.items():
+            value = result.get(metric)
+            if value is None or isinstance(value, bool):
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            key = (result.get('event_name'), result.get('gender'), metric)
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = RunningStats(start, end)
+            stats.add(value)
+
+    def drop_event(self, event_name: str):
+        """Forget an event's summaries, e.g. before rebuilding them from stored rows"""
+        for key in [key for key in self.stats if key[0] == event_name]:
+            del self.stats[key]
+
+    def rows(self) -> List[Dict]:
+        """Summary rows in apex_event_stats format"""
+        rows = []
+        for (event_name, gender, metric), stats in sorted(self.stats.items(), key=lambda item: tuple(map(str, item[0]))):
+            row = {'event_name': event_name, 'gender': gender, 'metric': metric}
+            row.update(stats.as_row())
+            rows.append(row)
+        return rows
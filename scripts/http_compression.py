@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete HTTP compression helpers
+Negotiates compressed downloads and gzip-encodes large request bodies
+
+requests only advertises gzip and deflate by default. Brotli is added when a
+decoder (brotli or brotlicffi) is installed, since urllib3 decodes it
+transparently in that case; requirements.txt pins brotli, and the bundle
+ships it beside msgspec. Request bodies are never compressed unless the
+caller opts in, because not every endpoint accepts Content-Encoding: gzip.
+"""
+
+import gzip
+import importlib.util
+import json
+import logging
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# urllib3 imports the decoder itself; only its presence matters here
+BROTLI_AVAILABLE = any(importlib.util.find_spec(name) for name in ('brotli', 'brotlicffi'))
+
+ACCEPT_ENCODING = 'br, gzip, deflate' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+# Bodies smaller than this are sent as-is; gzip overhead outweighs the savings
+GZIP_MIN_BYTES = 16 * 1024
+
+
+def encode_json_body(data: Any, compress: bool = False, min_bytes: int = GZIP_MIN_BYTES) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize a JSON body, gzip-encoding it when enabled and large enough
+
+    Returns the body and the headers to send with it.
+    """
+    # NaN and Infinity are not valid JSON; reject them like requests' json= does
+    body = json.dumps(data, separators=(',', ':'), allow_nan=False).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+
+    if compress and len(body) >= min_bytes:
+        compressed = gzip.compress(body, compresslevel=6)
+        logger.info(f"Request body: {len(compressed)} bytes gzip ({len(body)} bytes uncompressed, "
+                    f"{_ratio(len(compressed), len(body))})")
+        headers['Content-Encoding'] = 'gzip'
+        return compressed, headers
+
+    return body, headers
+
+
+def log_transfer(response, label: str):
+    """Log compressed (wire) vs uncompressed byte counts for a response
+
+    Must be called after the body has been read. urllib3 counts raw bytes
+    pulled off the socket, which is the compressed size when the server
+    applied a Content-Encoding.
+    """
+    decoded = len(response.content)
+    encoding = response.headers.get('Content-Encoding', 'identity')
+
+    wire = None
+    raw = getattr(response, 'raw', None)
+    if raw is not None and hasattr(raw, 'tell'):
+        try:
+            wire = raw.tell()
+        except (OSError, ValueError):
+            wire = None
+    if not wire:
+        wire = int(response.headers.get('Content-Length', decoded) or decoded)
+
+    # Small lookups would drown out the transfers that matter
+    level = logging.INFO if decoded >= GZIP_MIN_BYTES else logging.DEBUG
+    logger.log(level, f"{label}: {wire} bytes on the wire ({encoding}), {decoded} bytes decoded "
+                      f"({_ratio(wire, decoded)})")
+
+
+def _ratio(compressed: int, uncompressed: int) -> str:
+    """Format the compression ratio"""
+    if not compressed or not uncompressed:
+        return 'n/a'
+    return f"{uncompressed / compressed:.1f}x"
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete lazy imports
+Defers loading heavy third-party modules until they are first used
+
+    requests = lazy_import('requests')
+
+binds a module object whose code only runs on first attribute access, so
+paths that never touch it (--help, argument errors, scrapers that do not
+parse HTML) skip its import cost entirely.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return name as a module that is executed on first attribute access
+
+    Raises ImportError right away if the module is not installed, like a
+    normal import would.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
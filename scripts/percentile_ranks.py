@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete percentile ranks
+Precomputes per-gender percentile ranks for every metric and category score
+
+Each result gets two percentiles per field: within its own event and across
+all time. All-time values are kept in one sorted array per (gender, field);
+new results are inserted with bisect, and ranks are binary searches against
+those arrays, so a new event costs O(log n) per value instead of a re-sort.
+Seeding from the full table appends everything and sorts each array once.
+
+Ranks are written to a side table so the app can read a single row:
+
+    create table apex_result_percentiles (
+        result_id bigint primary key references apex_event_results(id),
+        event_name text not null,
+        gender text not null,
+        apex_score_event_pct real, apex_score_all_time_pct real,
+        ...                                  -- one pair per field in FIELDS
+        updated_at timestamptz default now()
+    );
+"""
+
+import bisect
+from typing import Any, Dict, List, Optional, Tuple
+
+from apex_metrics import METRICS, METRICS_BY_FIELD, SCORE_FIELDS, parse_field
+
+FIELDS: List[str] = SCORE_FIELDS + [m['field'] for m in METRICS]
+
+# Percentiles are stored with one decimal place; smaller moves are not rewritten
+PRECISION = 1
+
+
+def percentile_of(sorted_values: List[float], value: float, higher_is_better: bool = True) -> float:
+    """Midrank percentile of value within sorted_values (0-100, higher is better)"""
+    n = len(sorted_values)
+    if n == 0:
+        return 0.0
+    lo = bisect.bisect_left(sorted_values, value)
+    hi = bisect.bisect_right(sorted_values, value)
+    worse = lo if higher_is_better else n - hi
+    return round(100.0 * (worse + 0.5 * (hi - lo)) / n, PRECISION)
+
+
+def _higher_is_better(field: str) -> bool:
+    """Scores always rank high-to-low; timed events rank low-to-high"""
+    metric = METRICS_BY_FIELD.get(field)
+    return metric is None or metric['higher_is_better']
+
+
+def result_key(result: Dict) -> Any:
+    """Key a result by its database id, or by its natural key before insert"""
+    if result.get('id') is not None:
+        return result['id']
+    return (result.get('event_name'), result.get('gender'), result.get('athlete_name'))
+
+
+class PercentileIndex:
+    """Sorted per-(gender, field) value arrays and the ranks derived from them"""
+
+    def __init__(self):
+        """Start with an empty index"""
+        self.sorted_values: Dict[Tuple[str, str], List[float]] = {}
+        # result key -> {'event_name', 'gender', 'values', 'event_pct'}
+        self.rows: Dict[Any, Dict] = {}
+        # result key -> percentile row as last written to the side table
+        self.published: Dict[Any, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add_rows(self, results: List[Dict], bulk: bool = False):
+        """Add newly loaded results, ranking them within their event
+
+        With bulk=True values are appended and each touched array is sorted
+        once at the end, which is cheaper than one insort per value when
+        loading a whole table.
+        """
+        events: Dict[Tuple[str, str], List[Tuple[Any, Dict[str, float]]]] = {}
+        touched = set()
+
+        for result in results:
+            key = result_key(result)
+            if key in self.rows:
+                continue
+            gender = result.get('gender')
+            values = {}
+            for field in FIELDS:
+                value = parse_field(field, result.get(field))
+                if value is not None:
+                    values[field] = value
+                    if bulk:
+                        self.sorted_values.setdefault((gender, field), []).append(value)
+                        touched.add((gender, field))
+                    else:
+                        bisect.insort(self.sorted_values.setdefault((gender, field), []), value)
+            self.rows[key] = {
+                'event_name': result.get('event_name'),
+                'gender': gender,
+                'values': values,
+                'event_pct': {}
+            }
+            events.setdefault((result.get('event_name'), gender), []).append((key, values))
+
+        for array_key in touched:
+            self.sorted_values[array_key].sort()
+
+        for members in events.values():
+            for field in FIELDS:
+                event_values = sorted(values[field] for _, values in members if field in values)
+                for key, values in members:
+                    if field in values:
+                        self.rows[key]['event_pct'][field] = percentile_of(
+                            event_values, values[field], _higher_is_better(field)
+                        )
+
+    def load_published(self, rows: List[Dict]):
+        """Remember percentile rows already stored so unchanged rows are skipped"""
+        for row in rows:
+            self.published[row['result_id']] = {k: v for k, v in row.items() if k != 'updated_at'}
+
+    def percentile_row(self, key: Any) -> Dict:
+        """Build the side-table row for one result"""
+        entry = self.rows[key]
+        row = {
+            'result_id': key if not isinstance(key, tuple) else None,
+            'event_name': entry['event_name'],
+            'gender': entry['gender']
+        }
+        for field in FIELDS:
+            value = entry['values'].get(field)
+            row[f'{field}_event_pct'] = entry['event_pct'].get(field)
+            row[f'{field}_all_time_pct'] = (
+                percentile_of(self.sorted_values[(entry['gender'], field)], value, _higher_is_better(field))
+                if value is not None else None
+            )
+        return row
+
+    def changed_rows(self) -> List[Dict]:
+        """Return percentile rows that differ from what was last written
+
+        New events shift the all-time ranks of older results, so every row is
+        re-ranked against the current arrays, but only rows whose rounded
+        percentiles moved are returned. They count as written only once
+        mark_published is called for them.
+        """
+        changed = []
+        for key in self.rows:
+            row = self.percentile_row(key)
+            if self.published.get(key) != row:
+                changed.append(row)
+        return changed
+
+    def mark_published(self, rows: List[Dict]):
+        """Record rows the side table accepted so they are not rewritten"""
+        for row in rows:
+            self.published[row['result_id']] = row
+
+    def lookup(self, gender: str, field: str, value: Any) -> Optional[float]:
+        """All-time percentile of an arbitrary value, e.g. for the score calculator"""
+        parsed = parse_field(field, value)
+        values = self.sorted_values.get((gender, field))
+        if parsed is None or not values:
+            return None
+        return percentile_of(values, parsed, _higher_is_better(field))
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete Results Reconciliation
+Audits apex_event_results against the results published on apexathleteofficial.com
+
+The table is streamed in fixed-size pages using keyset pagination on id, and
+each row is folded into an order-independent hash per (event, gender). Only
+buckets whose hash or row count differs from the parsed data.js are read
+again, one bucket at a time, to list the missing, extra and differing rows.
+Memory is bounded by the parsed site data plus one bucket, however large the
+table grows.
+
+Setup and Usage:
+----------------
+
+# Same environment as the scrapers
+cd scripts && python3 -m venv venv && source venv/bin/activate && pip install -r requirements.txt
+
+# Report differences between the site and the database
+python reconcile_results.py
+
+# Write the full report as JSON and use smaller pages
+python reconcile_results.py --report reconcile.json --page-size 500
+
+"""
+
+import sys
+import logging
+import argparse
+import hashlib
+import json
+from typing import Dict, Iterable, List, Tuple
+
+from athlete_decoder import INSTAGRAM_PLACEHOLDER
+from cli_support import load_env, positive_int
+from scrape_apex_results import ApexResultsScraper
+
+logger = logging.getLogger(__name__)
+
+# Columns that must match between the site and the database
+COMPARED_COLUMNS = [
+    'date', 'athlete_rank', 'apex_score',
+    'speed_score', 'power_score', 'strength_score', 'endurance_score',
+    'fast_forty', 'max_toss', 'the_vertical', 'the_broad', 'the_push', 'the_pull', 'the_mile',
+    'instagram_handle'
+]
+
+HASH_MASK = (1 << 64) - 1
+
+
+def normalize_value(value) -> str:
+    """Canonical text for a value so 812, 812.0 and "812" hash the same
+
+    The site's '@handle' placeholder, which older rows still hold, counts as
+    a missing Instagram handle.
+    """
+    if value is None or value == INSTAGRAM_PLACEHOLDER:
+        return ''
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return f"{float(value):g}"
+    text = str(value).strip()
+    try:
+        return f"{float(text):g}"
+    except ValueError:
+        return text
+
+
+def row_key(row: Dict) -> str:
+    """Natural key of a result within its (event, gender) bucket"""
+    return normalize_value(row.get('athlete_name')).lower()
+
+
+def row_hash(row: Dict) -> int:
+    """64-bit hash of a row's key and compared columns"""
+    canonical = '\x1f'.join([row_key(row)] + [normalize_value(row.get(c)) for c in COMPARED_COLUMNS])
+    return int.from_bytes(hashlib.sha256(canonical.encode('utf-8')).digest()[:8], 'big')
+
+
+class BucketDigest:
+    """Order-independent digest of the rows in one (event, gender) bucket"""
+
+    __slots__ = ('count', 'total')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+
+    def add(self, row: Dict):
+        # Summing hashes makes the digest independent of row order while
+        # still changing when a row is duplicated
+        self.count += 1
+        self.total = (self.total + row_hash(row)) & HASH_MASK
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BucketDigest) and (self.count, self.total) == (other.count, other.total)
+
+
+def digest_rows(rows: Iterable[Dict]) -> Dict[Tuple[str, str], BucketDigest]:
+    """Fold a stream of rows into per-(event, gender) digests"""
+    digests: Dict[Tuple[str, str], BucketDigest] = {}
+    for row in rows:
+        key = (row.get('event_name'), row.get('gender'))
+        digests.setdefault(key, BucketDigest()).add(row)
+    return digests
+
+
+def compare_bucket(source_rows: List[Dict], db_rows: Iterable[Dict]) -> Dict[str, List[Dict]]:
+    """List missing, extra and differing rows between one source and database bucket"""
+    source_by_key: Dict[str, List[Dict]] = {}
+    for row in source_rows:
+        source_by_key.setdefault(row_key(row), []).append(row)
+
+    report = {'missing': [], 'extra': [], 'differing': []}
+    for db_row in db_rows:
+        candidates = source_by_key.get(row_key(db_row))
+        if not candidates:
+            # Either not on the site at all, or a duplicate of a row already matched
+            report['extra'].append(db_row)
+            continue
+
+        source_row = candidates.pop(0)
+        if row_hash(source_row) != row_hash(db_row):
+            changed = {
+                column: {'source': source_row.get(column), 'database': db_row.get(column)}
+                for column in COMPARED_COLUMNS
+                if normalize_value(source_row.get(column)) != normalize_value(db_row.get(column))
+            }
+            report['differing'].append({'id': db_row.get('id'), 'athlete_name': db_row.get('athlete_name'),
+                                        'columns': changed})
+
+    for remaining in source_by_key.values():
+        report['missing'].extend(remaining)
+
+    return report
+
+
+class ResultsReconciler:
+    """Compares parsed data.js results with apex_event_results"""
+
+    def __init__(self, scraper: ApexResultsScraper):
+        self.scraper = scraper
+        self.select = ','.join(['id', 'event_name', 'gender', 'athlete_name'] + COMPARED_COLUMNS)
+
+    def load_source(self) -> Dict[Tuple[str, str], List[Dict]]:
+        """Parse every event on the site into (event, gender) buckets"""
+        buckets: Dict[Tuple[str, str], List[Dict]] = {}
+        for event in self.scraper.get_event_links():
+            for row in self.scraper.iter_event_results(event['url'], event['name'], event.get('date', '')):
+                buckets.setdefault((row['event_name'], row['gender']), []).append(row)
+        return buckets
+
+    def reconcile(self) -> Dict:
+        """Run the audit and return a report"""
+        source = self.load_source()
+        if not source:
+            raise RuntimeError("No results parsed from the site; refusing to reconcile against nothing")
+
+        source_digests = digest_rows(row for rows in source.values() for row in rows)
+
+        logger.info(f"Streaming {self.scraper.TABLE_NAME} in pages of {self.scraper.PAGE_SIZE}")
+        db_digests = digest_rows(self.scraper.fetch_all_rows(self.scraper.TABLE_NAME, self.select))
+        logger.info(f"Hashed {sum(d.count for d in db_digests.values())} database rows "
+                    f"in {len(db_digests)} (event, gender) buckets")
+
+        report = {'matching_buckets': 0, 'buckets': []}
+        for key in sorted(set(source_digests) | set(db_digests), key=lambda k: (str(k[0]), str(k[1]))):
+            source_digest = source_digests.get(key)
+            db_digest = db_digests.get(key)
+            if source_digest == db_digest:
+                report['matching_buckets'] += 1
+                continue
+
+            event_name, gender = key
+            if db_digest is None:
+                bucket = {'missing': source[key], 'extra': [], 'differing': []}
+            elif source_digest is None:
+                # Event is not on the site any more; count it rather than listing every row
+                bucket = {'missing': [], 'extra': [], 'differing': [], 'extra_count': db_digest.count}
+            else:
+                db_rows = self.scraper.fetch_all_rows(
+                    self.scraper.TABLE_NAME, self.select,
+                    filters={'event_name': f'eq.{event_name}', 'gender': f'eq.{gender}'}
+                )
+                bucket = compare_bucket(source[key], db_rows)
+
+            bucket.update({'event_name': event_name, 'gender': gender,
+                           'source_rows': source_digest.count if source_digest else 0,
+                           'database_rows': db_digest.count if db_digest else 0})
+            report['buckets'].append(bucket)
+
+        return report
+
+
+def summarize(report: Dict) -> List[str]:
+    """One line per mismatched bucket"""
+    lines = []
+    for bucket in report['buckets']:
+        extra = bucket.get('extra_count', len(bucket['extra']))
+        lines.append(f"{bucket['event_name']} ({bucket['gender']}): {len(bucket['missing'])} missing, "
+                     f"{extra} extra, {len(bucket['differing'])} differing "
+                     f"(site {bucket['source_rows']}, database {bucket['database_rows']})")
+    return lines
+
+
+def main():
+    """Main entry point"""
+    load_env()
+
+    parser = argparse.ArgumentParser(
+        description='Audit apex_event_results against the results published on the site',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Report differences between the site and the database
+  python reconcile_results.py
+
+  # Save the full row-level report
+  python reconcile_results.py --report reconcile.json
+
+Exit status is 0 when everything matches, 2 when differences were found and
+1 when the audit could not run.
+
+Environment Variables Required:
+  SUPABASE_URL - Your Supabase project URL
+  SUPABASE_KEY - Your Supabase service role key
+        """
+    )
+
+    parser.add_argument(
+        '--page-size',
+        type=positive_int,
+        default=ApexResultsScraper.PAGE_SIZE,
+        help='Rows per keyset page when streaming the table (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--report',
+        metavar='PATH',
+        help='Write the full report, including row-level differences, as JSON'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        scraper = ApexResultsScraper(quarantine_path=None)
+        scraper.PAGE_SIZE = args.page_size
+        report = ResultsReconciler(scraper).reconcile()
+    except Exception as e:
+        logger.error(f"Reconciliation failed: {e}", exc_info=True)
+        return 1
+
+    lines = summarize(report)
+    logger.info(f"{report['matching_buckets']} bucket(s) match, {len(lines)} differ")
+    if lines:
+        # Log differences for GitHub Actions to parse
+        logger.info(f"RECONCILE_DIFF: {' | '.join(lines)}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        logger.info(f"Wrote report to {args.report}")
+
+    return 2 if lines else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
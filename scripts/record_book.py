@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete record derivation
+Keeps the best value for every (event, gender) as results stream in
+
+The record holders page is maintained by hand and can lag behind the results
+page. RecordBook derives the same records from the results themselves: each
+result is offered once and only replaces the current best when it beats it,
+so loading a new event never requires rescanning apex_event_results.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from apex_metrics import METRICS, METRICS_BY_EVENT, is_better, parse_field, parse_metric_value
+
+logger = logging.getLogger(__name__)
+
+
+class RecordBook:
+    """Best performance per (event, gender) derived from results"""
+
+    def __init__(self):
+        """Start with no records"""
+        # (event_name, gender) -> record entry in apex_record_holders shape plus parsed value
+        self.records: Dict[Tuple[str, str], Dict] = {}
+        # True once the book has seen every stored result, not just recent runs
+        self.complete = False
+
+    def offer(self, result: Dict) -> List[Dict]:
+        """Offer one apex_event_results row; return the records it broke"""
+        broken = []
+        gender = result.get('gender')
+
+        for metric in METRICS:
+            value = parse_field(metric['field'], result.get(metric['field']))
+            if value is None:
+                continue
+
+            key = (metric['event_name'], gender)
+            current = self.records.get(key)
+            if current is not None and not is_better(metric['field'], value, current['value']):
+                continue
+
+            self.records[key] = {
+                'category': metric['category'],
+                'event_name': metric['event_name'],
+                'gender': gender,
+                'record_holder': result.get('athlete_name'),
+                'record_value': str(result.get(metric['field'])),
+                'instagram_handle': result.get('instagram_handle'),
+                'source_event': result.get('event_name'),
+                'value': value
+            }
+            broken.append(self.records[key])
+
+        return broken
+
+    def offer_all(self, results: List[Dict]) -> List[Dict]:
+        """Offer a batch of results; return the records that changed"""
+        changed = {}
+        for result in results:
+            for record in self.offer(result):
+                changed[(record['event_name'], record['gender'])] = record
+        return list(changed.values())
+
+    def as_rows(self) -> List[Dict]:
+        """Return the derived records in apex_record_holders row format"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        rows = []
+        for (event_name, gender), record in sorted(self.records.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            rows.append({
+                'category': record['category'],
+                'event_name': event_name,
+                'gender': gender,
+                'record_holder': record['record_holder'],
+                'record_value': record['record_value'],
+                'instagram_handle': record['instagram_handle'],
+                'last_updated': today
+            })
+        return rows
+
+    def diff(self, scraped: List[Dict], complete: bool = True) -> List[Dict]:
+        """Compare derived records with scraped apex_record_holders rows
+
+        Returns one entry per (event, gender) whose holder or value differs.
+        When the book has seen the complete results history, records that
+        exist on only one side or that the results fall short of are reported
+        too; otherwise only results that match or beat a record are.
+        """
+        scraped_by_key = {}
+        for record in scraped:
+            metric = METRICS_BY_EVENT.get(str(record.get('event_name', '')).lower())
+            if metric is None:
+                continue
+            scraped_by_key[(metric['event_name'], record.get('gender'))] = record
+
+        differences = []
+        for key in sorted(set(self.records) | set(scraped_by_key), key=lambda k: (k[0], str(k[1]))):
+            derived = self.records.get(key)
+            scraped_record = scraped_by_key.get(key)
+            metric = METRICS_BY_EVENT[key[0].lower()]
+
+            if derived is None:
+                if not complete:
+                    continue
+                reason = 'missing_from_results'
+            elif scraped_record is None:
+                reason = 'missing_from_records'
+            else:
+                scraped_value = parse_metric_value(metric['unit'], scraped_record.get('record_value'))
+                same_value = scraped_value is not None and abs(scraped_value - derived['value']) < 1e-9
+                same_holder = (str(scraped_record.get('record_holder', '')).strip().lower()
+                               == str(derived['record_holder'] or '').strip().lower())
+                if same_value and same_holder:
+                    continue
+                if scraped_value is not None and is_better(metric['field'], derived['value'], scraped_value):
+                    reason = 'results_beat_record'
+                elif same_value:
+                    reason = 'holder_mismatch'
+                elif complete:
+                    reason = 'record_beats_results'
+                else:
+                    continue
+
+            differences.append({
+                'event_name': key[0],
+                'gender': key[1],
+                'reason': reason,
+                'derived_holder': derived['record_holder'] if derived else None,
+                'derived_value': derived['record_value'] if derived else None,
+                'derived_event': derived['source_event'] if derived else None,
+                'scraped_holder': scraped_record.get('record_holder') if scraped_record else None,
+                'scraped_value': scraped_record.get('record_value') if scraped_record else None
+            })
+
+        return differences
+
+    def load(self, path: str) -> bool:
+        """Load previously derived records from a JSON state file
+
+        Older state files are a bare list of records and are loaded as
+        incomplete, since nothing says they were seeded from the full history.
+        """
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load record state from {path}: {e}")
+            return False
+
+        entries = state if isinstance(state, list) else state.get('records', [])
+        for entry in entries:
+            self.records[(entry['event_name'], entry['gender'])] = entry
+        self.complete = isinstance(state, dict) and state.get('complete') is True
+        logger.info(f"Loaded {len(entries)} derived records from {path}"
+                    f"{'' if self.complete else ' (not yet seeded from the full results history)'}")
+        return True
+
+    def save(self, path: str):
+        """Persist derived records so the next run continues incrementally"""
+        if not path:
+            return
+        with open(path, 'w') as f:
+            json.dump({'complete': self.complete, 'records': list(self.records.values())}, f, indent=2)
+        logger.info(f"Saved {len(self.records)} derived records to {path}")
+
+def format_difference(difference: Dict) -> str:
+    """Format a record difference as a single log line"""
+    gender = (difference['gender'] or '?')[0]
+    if difference['reason'] == 'missing_from_results':
+        return (f"{difference['event_name']} ({gender}): record {difference['scraped_holder']} - "
+                f"{difference['scraped_value']} not found in results")
+    if difference['reason'] == 'missing_from_records':
+        return (f"{difference['event_name']} ({gender}): no published record, results best is "
+                f"{difference['derived_holder']} - {difference['derived_value']}")
+    return (f"{difference['event_name']} ({gender}): results {difference['derived_holder']} - "
+            f"{difference['derived_value']} vs record {difference['scraped_holder']} - "
+            f"{difference['scraped_value']} ({difference['reason']})")
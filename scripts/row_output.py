@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete dry-run row output
+Streams scraped rows as JSON Lines or CSV instead of the pretty printer
+
+Rows are written as soon as they are parsed and flushed per row, so a dry run
+uses constant memory and can be piped straight into other tools:
+
+    python scrape_apex_results.py --dry-run --output jsonl | jq .athlete_name
+"""
+
+import csv
+import json
+import sys
+from typing import Dict, List, Optional, TextIO
+
+OUTPUT_FORMATS = ['pretty', 'jsonl', 'csv']
+
+
+class JsonlRowWriter:
+    """Write one JSON object per line"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, row: Dict):
+        self.stream.write(json.dumps(row, ensure_ascii=False, sort_keys=True) + '\n')
+        self.stream.flush()
+        self.count += 1
+
+    def close(self):
+        self.stream.flush()
+
+
+class CsvRowWriter:
+    """Write rows as CSV with a fixed header"""
+
+    def __init__(self, stream: TextIO, fields: List[str]):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=fields, extrasaction='ignore', lineterminator='\n')
+        self.writer.writeheader()
+        self.count = 0
+
+    def write(self, row: Dict):
+        self.writer.writerow(row)
+        self.stream.flush()
+        self.count += 1
+
+    def close(self):
+        self.stream.flush()
+
+
+def make_row_writer(output: str, fields: List[str], stream: Optional[TextIO] = None):
+    """Return a streaming writer for jsonl/csv, or None for the pretty printer"""
+    stream = stream or sys.stdout
+    if output == 'jsonl':
+        return JsonlRowWriter(stream)
+    if output == 'csv':
+        return CsvRowWriter(stream, fields)
+    return None
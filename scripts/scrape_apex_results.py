@@ -23,11 +23,31 @@ import logging
 import argparse
 import json
 from datetime import datetime
-from typing import List, Dict, Optional
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, List, Dict, Optional
+import threading
 import time
-from dotenv import load_dotenv
+
+from apex_metrics import METRICS
+from athlete_decoder import AthleteDecoder
+from batch_isolation import BatchInsertError, DeadLetterFile, insert_isolating, request_error
+from cli_support import load_env, positive_int
+from conditional_fetch import ConditionalFetcher
+from event_stats import METRIC_RANGES as STATS_METRICS, EventStatistics
+from lazy_imports import lazy_import
+from http_compression import ACCEPT_ENCODING, encode_json_body, log_transfer
+from postgres_sink import PostgresSink
+from percentile_ranks import FIELDS as PERCENTILE_FIELDS, PercentileIndex
+from record_book import RecordBook, format_difference
+from search_index import SearchIndex
+from stage_pipeline import Stage, StagePipeline
+from row_output import OUTPUT_FORMATS, make_row_writer
+
+# Loaded on first use, so --help and argument errors never pay for them
+requests = lazy_import('requests')
+bs4 = lazy_import('bs4')
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 # Configure logging
 logging.basicConfig(
@@ -43,10 +63,62 @@ class ApexResultsScraper:
     BASE_URL = "https://apexathleteofficial.com"
     RESULTS_URL = f"{BASE_URL}/events/results/"
     TABLE_NAME = "apex_event_results"
+    IFRAME_URL = f"{BASE_URL}/apex_pages/apex_results_page/index.html"
+    RECORDS_TABLE_NAME = "apex_record_holders"
+    PERCENTILES_TABLE_NAME = "apex_result_percentiles"
+    STATS_TABLE_NAME = "apex_event_stats"
+    SEARCH_TABLE_NAME = "apex_athlete_search"
+    PAGE_SIZE = 1000
+    REQUEST_DELAY = 2  # Seconds between events, to be polite to the site
+    PIPELINE_QUEUE_SIZE = 2  # Events buffered between pipeline stages
+    RESULT_COLUMNS = [
+        'event_name', 'date', 'athlete_rank', 'athlete_name', 'apex_score', 'gender',
+        'speed_score', 'power_score', 'strength_score', 'endurance_score',
+        'fast_forty', 'max_toss', 'the_vertical', 'the_broad', 'the_push', 'the_pull', 'the_mile',
+        'instagram_handle'
+    ]
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, record_state: Optional[str] = None, percentiles: bool = False,
+                 output: str = 'pretty', gzip_requests: bool = False,
+                 quarantine_path: Optional[str] = 'quarantined_athletes.jsonl', sink: str = 'postgrest',
+                 dead_letter_path: Optional[str] = 'dead_letter_rows.jsonl', event_stats: bool = False,
+                 search_index: bool = False, search_artifact_dir: Optional[str] = None,
+                 workers: Optional[Dict[str, int]] = None, pending_state: Optional[str] = None):
         """Initialize scraper with Supabase connection"""
         self.dry_run = dry_run
+        self.dead_letter = DeadLetterFile(dead_letter_path)
+        # Pipeline stages run in threads: errors are per thread, shared indexes are locked
+        self._thread_state = threading.local()
+        self._state_lock = threading.Lock()
+        self.workers = {'fetch': 1, 'parse': 1, 'write': 1}
+        self.workers.update(workers or {})
+        # Writes go through PostgREST unless a direct database connection is requested
+        self.pg_sink = PostgresSink(os.environ.get('SUPABASE_DB_URL')) if sink == 'postgres' and not dry_run else None
+        self.decoder = AthleteDecoder(quarantine_path)
+        self.gzip_requests = gzip_requests
+        # Machine-readable output streams rows in dry run instead of pretty printing them
+        self.row_writer = make_row_writer(output, self.RESULT_COLUMNS) if dry_run else None
+        self.record_state = record_state
+        self.record_book = RecordBook()
+        self._record_state_loaded = False
+        # Site connections and what we already know survive between watch passes
+        self.fetcher = ConditionalFetcher()
+        self.known_events = set()
+        self.skipped_events = set()
+        # Events whose download or insert failed; watch mode retries them next tick,
+        # and pending_state carries them over to the next run
+        self.pending_events = set()
+        self.pending_state = pending_state
+        self._pending_state_loaded = False
+        self.data_urls: List[str] = []
+        self.percentile_index = PercentileIndex() if percentiles else None
+        self._percentiles_seeded = False
+        self.event_stats = EventStatistics() if event_stats else None
+        # Events retried or left partly stored; their summaries are rebuilt from the table
+        self._stats_rebuild = set()
+        self.search_index = search_index
+        self.search_artifact_dir = search_artifact_dir
+        self._search_stale = False
         self.supabase_url = os.environ.get('SUPABASE_URL')
         self.supabase_key = os.environ.get('SUPABASE_KEY')
         
@@ -54,6 +126,7 @@ class ApexResultsScraper:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables must be set")
         
         self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
         if not dry_run:
             self.session.headers.update({
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
@@ -61,16 +134,13 @@ class ApexResultsScraper:
                 'Authorization': f'Bearer {self.supabase_key}'
             })
     
-    def fetch_page(self, url: str, retries: int = 3) -> Optional[BeautifulSoup]:
+    def fetch_page(self, url: str, retries: int = 3) -> Optional['BeautifulSoup']:
         """Fetch and parse a web page with retry logic"""
         for attempt in range(retries):
             try:
                 logger.info(f"Fetching: {url} (attempt {attempt + 1}/{retries})")
-                response = requests.get(url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                }, timeout=30)
-                response.raise_for_status()
-                return BeautifulSoup(response.content, 'html.parser')
+                html, _ = self.fetcher.get(url)
+                return bs4.BeautifulSoup(html, 'html.parser')
             except requests.RequestException as e:
                 logger.error(f"Error fetching {url}: {e}")
                 if attempt < retries - 1:
@@ -79,27 +149,89 @@ class ApexResultsScraper:
                     return None
         return None
     
-    def supabase_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Optional[Dict]:
+    @property
+    def last_error(self) -> Optional[Dict]:
+        """Error from this thread's most recent Supabase request"""
+        return getattr(self._thread_state, 'last_error', None)
+    
+    @last_error.setter
+    def last_error(self, error: Optional[Dict]):
+        self._thread_state.last_error = error
+    
+    def supabase_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None,
+                         prefer: str = 'return=representation') -> Optional[Dict]:
         """Make a request to Supabase REST API"""
         url = f"{self.supabase_url}/rest/v1/{endpoint}"
+        self.last_error = None
         
         try:
             if method.upper() == 'GET':
                 response = self.session.get(url, params=params)
             elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, headers={'Prefer': 'return=representation'})
+                try:
+                    body, headers = encode_json_body(data, compress=self.gzip_requests)
+                except ValueError as e:
+                    raise requests.exceptions.InvalidJSONError(e) from e
+                headers['Prefer'] = prefer
+                response = self.session.post(url, data=body, params=params, headers=headers)
+            elif method.upper() == 'DELETE':
+                response = self.session.delete(url, params=params)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
             response.raise_for_status()
+            log_transfer(response, f"Supabase {method.upper()} {endpoint}")
             return response.json() if response.text else None
             
         except requests.RequestException as e:
             logger.error(f"Supabase request failed: {e}")
             if hasattr(e.response, 'text'):
                 logger.error(f"Response: {e.response.text}")
+            self.last_error = request_error(e)
             return None
     
+    def fetch_all_rows(self, table: str, select: str, key: str = 'id', filters: Optional[Dict] = None):
+        """Yield every row of a table in fixed-size pages, keyed on an indexed column
+        
+        Pages continue from the last key seen (keyset pagination), so each
+        page is an index range scan no matter how deep into the table it is.
+        filters are extra PostgREST conditions such as {'gender': 'eq.Men'}.
+        """
+        last_key = None
+        while True:
+            params = dict(filters or {})
+            params.update({'select': select, 'order': f'{key}.asc', 'limit': self.PAGE_SIZE})
+            if last_key is not None:
+                params[key] = f'gt.{last_key}'
+            
+            page = self.supabase_request('GET', table, params=params)
+            if page is None:
+                raise RuntimeError(f"Failed to page through {table} after {key}={last_key}")
+            
+            yield from page
+            
+            if len(page) < self.PAGE_SIZE:
+                return
+            last_key = page[-1][key]
+    
+    def _post_rows(self, rows: List[Dict]):
+        """POST rows to the table, returning (inserted rows, error)"""
+        if self.pg_sink is not None:
+            # One COPY + merge transaction; duplicates are skipped by the UNIQUE constraint
+            return self.pg_sink.merge_rows(self.TABLE_NAME, self.RESULT_COLUMNS, rows)
+        
+        params, prefer = None, 'return=representation'
+        if rows[0]['event_name'] in self.pending_events:
+            # A retried event may be partly stored already; only the missing rows come back
+            params = {'on_conflict': 'event_name,gender,athlete_name'}
+            prefer = 'resolution=ignore-duplicates,return=representation'
+        response = self.supabase_request('POST', self.TABLE_NAME, data=rows, params=params, prefer=prefer)
+        if self.last_error is not None:
+            return None, self.last_error
+        if response is None:
+            return [], None
+        return (response if isinstance(response, list) else [response]), None
+    
     def event_exists(self, event_name: str) -> bool:
         """Check if an event already exists in the database"""
         if self.dry_run:
@@ -114,26 +246,279 @@ class ApexResultsScraper:
         result = self.supabase_request('GET', self.TABLE_NAME, params=params)
         return result is not None and len(result) > 0
     
-    def insert_results(self, results: List[Dict]) -> int:
-        """Insert event results into Supabase"""
+    def insert_results(self, results: List[Dict]) -> List[Dict]:
+        """Insert one event's results into Supabase; return the rows actually inserted
+        
+        If the insert fails, the event is kept in pending_events for a retry,
+        and the rows committed before the failure are returned.
+        """
         if not results:
-            return 0
+            return []
         
+        event_name = results[0]['event_name']
         if self.dry_run:
             # In dry run mode, just print what would be inserted
-            self._print_dry_run_results(results)
-            return len(results)
+            with self._state_lock:
+                self._print_dry_run_results(results)
+            self.pending_events.discard(event_name)
+            return results
         
         # Supabase will handle duplicates via UNIQUE constraint
-        response = self.supabase_request('POST', self.TABLE_NAME, data=results)
+        try:
+            response, requests_made = insert_isolating(self._post_rows, results, self.TABLE_NAME, self.dead_letter)
+            self.pending_events.discard(event_name)
+        except BatchInsertError as e:
+            logger.error(f"Failed to insert results: {e}")
+            # Rows committed before the failure still count
+            response, requests_made = e.inserted, e.requests_made
+            self.pending_events.add(event_name)
+        
+        if requests_made > 1:
+            logger.warning(f"Isolated rejected rows in {requests_made} requests; "
+                           f"{self.dead_letter.count} row(s) in dead-letter file so far")
         
         if response:
-            inserted = len(response) if isinstance(response, list) else 1
-            logger.info(f"Successfully inserted {inserted} results")
-            return inserted
+            logger.info(f"Successfully inserted {len(response)} results")
         else:
             logger.error("Failed to insert results")
+        return response
+    
+    def stream_results(self, event_url: str, event_name: str, event_date: str) -> int:
+        """Write each result to the dry-run row writer as soon as it is parsed"""
+        count = 0
+        event_rows = []
+        
+        for result in self.iter_event_results(event_url, event_name, event_date):
+            self.row_writer.write(result)
+            self.record_book.offer(result)
+            if self.event_stats is not None:
+                self.event_stats.add(result)
+            if self.percentile_index is not None:
+                # Within-event ranks need the whole event, so only keep rows when asked to
+                event_rows.append(result)
+            count += 1
+        
+        if event_rows:
+            self.percentile_index.add_rows(event_rows)
+        
+        return count
+    
+    def seed_records(self):
+        """Load the record state, then offer every stored result once if the book has never seen them all
+        
+        A state file saved after seeding is complete, so later runs only offer
+        the rows they insert.
+        """
+        if self._record_state_loaded:
+            return
+        self.record_book.load(self.record_state)
+        self._record_state_loaded = True
+        if self.record_book.complete or self.dry_run:
+            return
+        
+        select = ','.join(['id', 'event_name', 'gender', 'athlete_name', 'instagram_handle'] + [m['field'] for m in METRICS])
+        try:
+            self.record_book.offer_all(list(self.fetch_all_rows(self.TABLE_NAME, select)))
+        except RuntimeError as e:
+            logger.error(f"Failed to seed derived records, cross-check stays partial: {e}")
+            return
+        self.record_book.complete = True
+        logger.info(f"Seeded derived records from {self.TABLE_NAME}: {len(self.record_book.records)} records")
+    
+    def load_pending_events(self):
+        """Restore events a previous run left partly stored, once per process
+        
+        Without this, the next run would find the event's first rows, treat
+        the event as done and never insert the rest.
+        """
+        if self._pending_state_loaded or self.dry_run:
+            return
+        self._pending_state_loaded = True
+        if not self.pending_state or not os.path.exists(self.pending_state):
+            return
+        try:
+            with open(self.pending_state) as f:
+                self.pending_events.update(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load pending events from {self.pending_state}: {e}")
+            return
+        if self.pending_events:
+            logger.info(f"Loaded {len(self.pending_events)} pending event(s) from {self.pending_state}")
+    
+    def save_pending_events(self):
+        """Persist events still waiting for a retry so the next run finishes them"""
+        if not self.pending_state or self.dry_run:
+            return
+        with open(self.pending_state, 'w') as f:
+            json.dump(sorted(self.pending_events), f, indent=2)
+        if self.pending_events:
+            logger.warning(f"Saved {len(self.pending_events)} pending event(s) to {self.pending_state}")
+    
+    def seed_percentiles(self):
+        """Load existing results and stored percentiles once, before the first insert
+        
+        If either table cannot be read (for instance apex_result_percentiles
+        has not been created yet), results are still inserted; percentiles are
+        skipped and seeding is tried again on the next run.
+        """
+        if self.percentile_index is None or self._percentiles_seeded or self.dry_run:
+            return
+        
+        index = PercentileIndex()
+        try:
+            select = ','.join(['id', 'event_name', 'gender'] + PERCENTILE_FIELDS)
+            index.add_rows(list(self.fetch_all_rows(self.TABLE_NAME, select)), bulk=True)
+            
+            pct_columns = [f'{field}_{scope}_pct' for field in PERCENTILE_FIELDS for scope in ('event', 'all_time')]
+            select = ','.join(['result_id', 'event_name', 'gender'] + pct_columns)
+            index.load_published(list(self.fetch_all_rows(self.PERCENTILES_TABLE_NAME, select, key='result_id')))
+        except RuntimeError as e:
+            logger.error(f"Skipping percentile ranks, could not seed the index: {e}")
+            return
+        
+        # Rows inserted before a successful seed are part of what it loaded
+        self.percentile_index = index
+        self._percentiles_seeded = True
+        logger.info(f"Seeded percentile index with {len(self.percentile_index)} existing results")
+    
+    def publish_percentiles(self) -> int:
+        """Upsert percentile rows whose ranks changed since they were last written"""
+        if self.percentile_index is None or not (self._percentiles_seeded or self.dry_run):
             return 0
+        
+        rows = self.percentile_index.changed_rows()
+        if self.dry_run:
+            logger.info(f"DRY RUN: Would write percentile ranks for {len(rows)} results")
+            return len(rows)
+        
+        written = 0
+        for start in range(0, len(rows), self.PAGE_SIZE):
+            batch = rows[start:start + self.PAGE_SIZE]
+            response = self.supabase_request(
+                'POST', self.PERCENTILES_TABLE_NAME, data=batch,
+                params={'on_conflict': 'result_id', 'select': 'result_id'},
+                prefer='resolution=merge-duplicates,return=representation'
+            )
+            if response is None:
+                logger.error("Failed to write percentile ranks")
+                break
+            # Rows in failed batches stay changed, so the next run writes them again
+            self.percentile_index.mark_published(batch)
+            written += len(batch)
+        
+        logger.info(f"Wrote percentile ranks for {written} results")
+        return written
+    
+    def publish_event_stats(self) -> int:
+        """Upsert score summaries for the events scraped since the last publish"""
+        if self.event_stats is None:
+            return 0
+        
+        rows = self.event_stats.rows()
+        if self.dry_run:
+            for row in rows:
+                logger.info(f"EVENT_STATS: {row['event_name']} {row['gender']} {row['metric']}: n={row['count']} "
+                            f"mean={row['mean']} sd={row['stddev']} p10/p50/p90={row['p10']}/{row['p50']}/{row['p90']}")
+            logger.info(f"DRY RUN: Would write {len(rows)} event statistics rows")
+            return len(rows)
+        
+        # This run's rows are only part of a retried event, so summarise everything stored for it
+        rebuilt = set()
+        select = ','.join(['id', 'event_name', 'gender'] + list(STATS_METRICS))
+        for event_name in sorted(self._stats_rebuild):
+            try:
+                stored = list(self.fetch_all_rows(self.TABLE_NAME, select, filters={'event_name': f'eq.{event_name}'}))
+            except RuntimeError as e:
+                # A partial summary would overwrite a better one, so this event waits for the next publish
+                logger.error(f"Failed to rebuild statistics for '{event_name}': {e}")
+                self.event_stats.drop_event(event_name)
+                continue
+            self.event_stats.drop_event(event_name)
+            for row in stored:
+                self.event_stats.add(row)
+            rebuilt.add(event_name)
+        
+        rows = self.event_stats.rows()
+        if not rows:
+            return 0
+        
+        response = self.supabase_request(
+            'POST', self.STATS_TABLE_NAME, data=rows,
+            params={'on_conflict': 'event_name,gender,metric', 'select': 'event_name'},
+            prefer='resolution=merge-duplicates,return=representation'
+        )
+        if response is None:
+            # Keep the summaries so the next watch pass retries them
+            logger.error("Failed to write event statistics")
+            return 0
+        
+        self.event_stats = EventStatistics()
+        self._stats_rebuild -= rebuilt
+        logger.info(f"Wrote {len(rows)} event statistics rows")
+        return len(rows)
+    
+    def publish_search_index(self, new_results: int) -> int:
+        """Rebuild the athlete search index and write the terms that changed
+        
+        Skipped when the run inserted nothing, so idle runs and watch passes
+        do not page through the results table, unless an earlier write in
+        this process failed partway and left the table behind.
+        """
+        if not (self.search_index or self.search_artifact_dir):
+            return 0
+        if self.dry_run:
+            logger.info("DRY RUN: Would rebuild the athlete search index")
+            return 0
+        if not new_results and not self._search_stale:
+            return 0
+        
+        index = SearchIndex()
+        try:
+            index.add_rows(self.fetch_all_rows(self.TABLE_NAME, 'id,athlete_name,gender,apex_score'))
+        except RuntimeError as e:
+            logger.error(f"Skipping athlete search index: {e}")
+            self._search_stale = True
+            return 0
+        logger.info(f"Built search index for {len(index)} athletes")
+        
+        if self.search_artifact_dir:
+            path = index.write_artifact(self.search_artifact_dir)
+            logger.info(f"Wrote search index artifact {path}")
+        
+        written = 0
+        if self.search_index:
+            try:
+                published = {row['id']: row['digest'] for row in self.fetch_all_rows(self.SEARCH_TABLE_NAME, 'id,digest')}
+            except RuntimeError as e:
+                logger.error(f"Skipping athlete search terms: {e}")
+                self._search_stale = True
+                return 0
+            changed, stale = index.changed_rows(published)
+            
+            # Term rows carry athlete lists, so batches are smaller than result inserts
+            batch_size = self.PAGE_SIZE // 4
+            for start in range(0, len(changed), batch_size):
+                batch = changed[start:start + batch_size]
+                response = self.supabase_request(
+                    'POST', self.SEARCH_TABLE_NAME, data=batch,
+                    params={'on_conflict': 'id', 'select': 'id'},
+                    prefer='resolution=merge-duplicates,return=representation'
+                )
+                if response is None:
+                    logger.error("Failed to write search index terms")
+                    self._search_stale = True
+                    return written
+                written += len(batch)
+            
+            # Terms no athlete matches any more, e.g. after a name correction
+            for start in range(0, len(stale), 100):
+                ids = ','.join(f'"{term_id}"' for term_id in stale[start:start + 100])
+                self.supabase_request('DELETE', self.SEARCH_TABLE_NAME, params={'id': f'in.({ids})'})
+            
+            logger.info(f"Search index: {written} changed terms written, {len(stale)} stale terms removed")
+        
+        self._search_stale = False
+        return written
     
     def _print_dry_run_results(self, results: List[Dict]):
         """Print results in a formatted way for dry run mode"""
@@ -175,8 +560,7 @@ class ApexResultsScraper:
     def get_event_links(self) -> List[Dict[str, str]]:
         """Get all event links from the results page iframe"""
         # The actual results are in an iframe
-        iframe_url = f"{self.BASE_URL}/apex_pages/apex_results_page/index.html"
-        soup = self.fetch_page(iframe_url)
+        soup = self.fetch_page(self.IFRAME_URL)
         if not soup:
             logger.error("Failed to fetch results iframe page")
             return []
@@ -213,6 +597,7 @@ class ApexResultsScraper:
                 'date': event_date
             })
         
+        self.data_urls = sorted({event['url'] for event in events})
         logger.info(f"Found {len(events)} event(s)")
         return events
     
@@ -225,66 +610,40 @@ class ApexResultsScraper:
     
     def scrape_event_results(self, event_url: str, event_name: str, event_date_str: str) -> List[Dict]:
         """Scrape results from a data.js file"""
+        return list(self.iter_event_results(event_url, event_name, event_date_str))
+    
+    def iter_event_results(self, event_url: str, event_name: str, event_date_str: str):
+        """Yield results from a data.js file one athlete at a time"""
         logger.info(f"Scraping event: {event_name}")
         
         # Fetch the JavaScript file
         try:
-            response = requests.get(event_url, headers={
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }, timeout=30)
-            response.raise_for_status()
-            js_content = response.text
+            js_content, _ = self.fetcher.get_text(event_url)
         except requests.RequestException as e:
             logger.error(f"Failed to fetch data.js: {e}")
-            return []
+            return
         
-        # Parse the JavaScript to extract JSON data
-        results = []
+        yield from self.iter_parsed_results(js_content, event_name, event_date_str)
+    
+    def iter_parsed_results(self, js_content: str, event_name: str, event_date_str: str):
+        """Yield results from already-fetched data.js content"""
+        count = 0
         event_date = self._parse_event_date_from_string(event_date_str)
         
-        # Extract MEN array
-        men_data = self._extract_json_from_js(js_content, 'const MEN = ')
-        if men_data:
-            for athlete in men_data:
-                if athlete.get('apexScore', 0) > 0:  # Skip athletes with 0 scores
-                    results.append(self._parse_athlete_data(athlete, event_name, event_date, 'Men'))
-        
-        # Extract WOMEN array
-        women_data = self._extract_json_from_js(js_content, 'const WOMEN = ')
-        if women_data:
-            for athlete in women_data:
-                if athlete.get('apexScore', 0) > 0:  # Skip athletes with 0 scores
-                    results.append(self._parse_athlete_data(athlete, event_name, event_date, 'Women'))
-        
-        logger.info(f"Scraped {len(results)} total results for {event_name}")
-        return results
-    
-    def _parse_athlete_data(self, athlete: Dict, event_name: str, event_date: str, gender: str) -> Dict:
-        """Parse athlete data and extract all fields"""
-        return {
-            'event_name': event_name,
-            'date': event_date,
-            'athlete_rank': athlete.get('rank'),
-            'athlete_name': athlete.get('name'),
-            'apex_score': float(athlete.get('apexScore', 0)),
-            'gender': gender,
-            'speed_score': athlete.get('speedScore'),
-            'power_score': athlete.get('powerScore'),
-            'strength_score': athlete.get('strengthScore'),
-            'endurance_score': athlete.get('enduranceScore'),
-            'fast_forty': athlete.get('fastForty'),
-            'max_toss': athlete.get('maxToss'),
-            'the_vertical': athlete.get('theVert'),
-            'the_broad': athlete.get('theBroad'),
-            'the_push': athlete.get('thePush'),
-            'the_pull': athlete.get('thePull'),
-            'the_mile': athlete.get('theMile'),
-            'instagram_handle': athlete.get('instagram', '@handle') if athlete.get('instagram') != '@handle' else None
-        }
+        # Decode, validate and convert each gender's array in one pass
+        for gender, prefix in (('Men', 'const MEN = '), ('Women', 'const WOMEN = ')):
+            array_text = self._extract_array_text(js_content, prefix)
+            if array_text:
+                for result in self.decoder.decode(array_text, event_name, event_date, gender):
+                    count += 1
+                    yield result
+        
+        with self._state_lock:
+            self.decoder.flush_quarantine()
+        logger.info(f"Scraped {count} total results for {event_name}")
     
-    def _extract_json_from_js(self, js_content: str, prefix: str) -> Optional[List[Dict]]:
-        """Extract JSON array from JavaScript variable declaration"""
-        import json
+    def _extract_array_text(self, js_content: str, prefix: str) -> Optional[str]:
+        """Return the JSON text of an array from a JavaScript variable declaration"""
         import re
         
         # Find the variable declaration
@@ -294,12 +653,7 @@ class ApexResultsScraper:
         if not match:
             return None
         
-        try:
-            json_str = '[' + match.group(1) + ']'
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON: {e}")
-            return None
+        return '[' + match.group(1) + ']'
     
     def _parse_event_date_from_string(self, date_str: str) -> str:
         """Parse event date string like 'Oct 26, 2025 • Austin, TX' to YYYY-MM-DD"""
@@ -321,7 +675,7 @@ class ApexResultsScraper:
         # Default to current date if parsing fails
         return datetime.now().strftime('%Y-%m-%d')
     
-    def _extract_event_date(self, soup: BeautifulSoup) -> str:
+    def _extract_event_date(self, soup: 'BeautifulSoup') -> str:
         """Extract event date from page"""
         # Look for common date patterns
         date_patterns = [
@@ -360,7 +714,7 @@ class ApexResultsScraper:
         
         return None
     
-    def _scrape_gender_results(self, soup: BeautifulSoup, event_name: str, 
+    def _scrape_gender_results(self, soup: 'BeautifulSoup', event_name: str, 
                                event_date: str, gender: str) -> List[Dict]:
         """Scrape results for a specific gender"""
         results = []
@@ -403,7 +757,7 @@ class ApexResultsScraper:
         
         return results
     
-    def _scrape_div_based_results(self, soup: BeautifulSoup, event_name: str,
+    def _scrape_div_based_results(self, soup: 'BeautifulSoup', event_name: str,
                                   event_date: str, gender: str) -> List[Dict]:
         """Scrape results from div-based layout"""
         results = []
@@ -460,12 +814,113 @@ class ApexResultsScraper:
         except ValueError:
             return None
     
+    def fetch_record_holders(self) -> List[Dict]:
+        """Fetch the published record holders to compare derived records against"""
+        if self.dry_run:
+            # No database in dry run, so read the record holders page directly
+            from scrape_record_holders import ApexRecordHoldersScraper
+            return ApexRecordHoldersScraper(dry_run=True).scrape_records()
+        
+        params = {'select': 'category,event_name,gender,record_holder,record_value,instagram_handle'}
+        return self.supabase_request('GET', self.RECORDS_TABLE_NAME, params=params) or []
+    
+    def check_records(self, complete: bool) -> List[str]:
+        """Report differences between derived records and apex_record_holders"""
+        if not self.record_book.records:
+            return []
+        
+        scraped = self.fetch_record_holders()
+        if not scraped:
+            logger.warning("No record holders available to cross-check derived records")
+            return []
+        
+        differences = self.record_book.diff(scraped, complete=complete)
+        details = [format_difference(d) for d in differences]
+        
+        if details:
+            logger.warning(f"Derived records differ from {self.RECORDS_TABLE_NAME} in {len(details)} place(s)")
+            # Log record differences for GitHub Actions to parse
+            logger.info(f"RECORD_DIFF: {' | '.join(details)}")
+        else:
+            logger.info(f"Derived records match {self.RECORDS_TABLE_NAME}")
+        
+        return details
+    
+    def _is_new_event(self, event_name: str) -> bool:
+        """False (and remembered) if the event is already in the database"""
+        if self.event_exists(event_name):
+            logger.info(f"Event '{event_name}' already in database, skipping")
+            self.known_events.add(event_name)
+            self.skipped_events.add(event_name)
+            return False
+        return True
+    
+    def _paced(self, events: List[Dict]):
+        """Yield events REQUEST_DELAY seconds apart
+        
+        Be polite - don't hammer the server. Pacing the pipeline's input keeps
+        the delay out of the fetch stage's busy time.
+        """
+        for i, event in enumerate(events):
+            if i:
+                time.sleep(self.REQUEST_DELAY)
+            yield event
+    
+    def _fetch_stage(self, event: Dict):
+        """Pipeline stage: download an event's data.js"""
+        logger.info(f"Scraping event: {event['name']}")
+        try:
+            js_content, _ = self.fetcher.get_text(event['url'])
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch data.js: {e}")
+            self.pending_events.add(event['name'])
+            return None
+        return event, js_content
+    
+    def _parse_stage(self, item):
+        """Pipeline stage: decode an event's data.js into result rows"""
+        event, js_content = item
+        return event, list(self.iter_parsed_results(js_content, event['name'], event.get('date', '')))
+    
+    def _write_stage(self, item):
+        """Pipeline stage: insert an event's results and update derived state from the stored rows"""
+        event, results = item
+        if not results:
+            self.pending_events.discard(event['name'])
+            return None
+        
+        # Insert results into database (or just print in dry run)
+        retried = event['name'] in self.pending_events
+        inserted = self.insert_results(results)
+        
+        # Only stored rows feed derived state; they come back with the ids that key the percentile table
+        if inserted:
+            with self._state_lock:
+                # Only results that beat the current best touch the record book
+                self.record_book.offer_all(inserted)
+                if self.percentile_index is not None:
+                    self.percentile_index.add_rows(inserted)
+                if self.event_stats is not None:
+                    for row in inserted:
+                        self.event_stats.add(row)
+                    if retried or event['name'] in self.pending_events:
+                        self._stats_rebuild.add(event['name'])
+        
+        if not self.dry_run:
+            logger.info(f"Inserted {len(inserted)} results for '{event['name']}'")
+        return event['name'], len(inserted)
+    
+    def close(self):
+        """Release the direct database connection, if one was opened"""
+        if self.pg_sink is not None:
+            self.pg_sink.close()
+    
     def run(self):
         """Main scraping workflow"""
         mode = "DRY RUN MODE" if self.dry_run else "LIVE MODE"
         logger.info(f"Starting Apex Results Scraper - {mode}")
         
-        if self.dry_run:
+        if self.dry_run and self.row_writer is None:
             print("\n" + "🔍 "*20)
             print("DRY RUN MODE ENABLED - No data will be inserted into the database")
             print("🔍 "*20 + "\n")
@@ -477,40 +932,114 @@ class ApexResultsScraper:
             logger.warning("No events found to scrape")
             return {'total_results': 0, 'event_names': 'No events found'}
         
+        # Derived records and partly stored events carry over between runs when state files are given
+        self.seed_records()
+        self.load_pending_events()
+        
         # Process each event
         total_new_results = 0
         processed_events = []
         
-        for event in events:
-            event_name = event['name']
-            event_url = event['url']
-            event_date = event.get('date', '')
-            
-            # Check if event already exists in database
-            if self.event_exists(event_name):
-                logger.info(f"Event '{event_name}' already in database, skipping")
-                continue
-            
-            # Scrape event results
-            results = self.scrape_event_results(event_url, event_name, event_date)
+        # Pending events that left the site are no longer retried
+        self.pending_events &= {event['name'] for event in events}
+        
+        # Events seen in an earlier watch pass need no database round trip; a
+        # pending event may be partly stored, so it skips the existence check
+        new_events = [event for event in events if event['name'] not in self.known_events
+                      and (event['name'] in self.pending_events or self._is_new_event(event['name']))]
+        
+        if self.row_writer is not None:
+            # Streaming output is written in order as rows are parsed, so it stays sequential
+            for event in self._paced(new_events):
+                total_new_results += self.stream_results(event['url'], event['name'], event.get('date', ''))
+        else:
+            # New events shift all-time ranks, so the index needs the full history
+            # before the first insert; loading it here keeps it off the write path
+            if new_events:
+                self.seed_percentiles()
             
-            if results:
-                # Insert results into database (or just print in dry run)
-                inserted = self.insert_results(results)
+            # Fetch, parse and write overlap: event N is written while N+1 is parsed
+            pipeline = StagePipeline([
+                Stage('fetch', self._fetch_stage, self.workers['fetch']),
+                Stage('parse', self._parse_stage, self.workers['parse']),
+                Stage('write', self._write_stage, self.workers['write']),
+            ], queue_size=self.PIPELINE_QUEUE_SIZE)
+            for event_name, inserted in pipeline.run(self._paced(new_events)):
                 total_new_results += inserted
                 if not self.dry_run:
-                    logger.info(f"Inserted {inserted} results for '{event_name}'")
                     processed_events.append(event_name)
-            
-            # Be polite - don't hammer the server
-            time.sleep(2)
+                    if inserted and event_name not in self.pending_events:
+                        self.known_events.add(event_name)
+            pipeline.log_summary()
         
-        if self.dry_run:
+        self.publish_percentiles()
+        self.publish_event_stats()
+        self.publish_search_index(total_new_results)
+        
+        # Cross-check derived records against the published record holders
+        # Only complete if the book was seeded or no event was skipped without being offered to it
+        record_updates = self.check_records(complete=self.record_book.complete or not self.skipped_events)
+        self.record_book.save(self.record_state)
+        self.save_pending_events()
+        
+        if self.row_writer is not None:
+            self.row_writer.close()
+            logger.info(f"Dry run complete. Streamed {total_new_results} total results.")
+            return {'total_results': total_new_results, 'event_names': ', '.join(processed_events) if processed_events else 'No new events', 'record_updates': record_updates}
+        elif self.dry_run:
             print(f"\n✅ Dry run complete. Would have inserted {total_new_results} total results.")
-            return {'total_results': total_new_results, 'event_names': ', '.join(processed_events) if processed_events else 'No new events'}
+            return {'total_results': total_new_results, 'event_names': ', '.join(processed_events) if processed_events else 'No new events', 'record_updates': record_updates}
         else:
             logger.info(f"Scraping complete. Total new results: {total_new_results}")
-            return {'total_results': total_new_results, 'event_names': ', '.join(processed_events) if processed_events else 'No new events'}
+            return {'total_results': total_new_results, 'event_names': ', '.join(processed_events) if processed_events else 'No new events', 'record_updates': record_updates,
+                    'pending_events': sorted(self.pending_events)}
+    
+    def poll_for_changes(self) -> bool:
+        """Conditionally re-fetch the iframe and data.js; True if anything changed"""
+        changed = False
+        for url in [self.IFRAME_URL] + self.data_urls:
+            try:
+                _, url_changed = self.fetcher.get(url)
+            except requests.RequestException as e:
+                logger.error(f"Error polling {url}: {e}")
+                continue
+            changed = changed or url_changed
+        return changed
+    
+    def watch(self, interval: int, notify=None):
+        """Poll the site every interval seconds and process only what changed
+        
+        The first pass behaves like a normal run. After that, each idle poll
+        is a conditional GET per URL, and a full pass only happens when the
+        iframe or data.js actually changed, or a failed pass or event is
+        still waiting to be retried.
+        """
+        logger.info(f"Watching {self.IFRAME_URL} every {interval}s")
+        # The first pass always runs, and so does the one after a pass that raised
+        retry = True
+        
+        try:
+            while True:
+                try:
+                    if retry or self.pending_events or self.poll_for_changes():
+                        if self.pending_events:
+                            logger.info(f"Retrying {len(self.pending_events)} pending event(s)")
+                        retry = True
+                        result = self.run()
+                        retry = False
+                        if notify and result.get('total_results'):
+                            notify(result, success=True)
+                    else:
+                        logger.debug("No changes since last poll")
+                except Exception as e:
+                    # Keep watching; a transient failure should not stop the daemon
+                    logger.error(f"Watch pass failed: {e}", exc_info=True)
+                    if notify:
+                        notify({}, success=False)
+                
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logger.info("Watch stopped")
 
 
 def send_slack_notification(result: Dict, success: bool = True):
@@ -522,15 +1051,23 @@ def send_slack_notification(result: Dict, success: bool = True):
     
     total = result.get('total_results', 0)
     event_names = result.get('event_names', 'No events')
+    record_updates = result.get('record_updates', [])
     
     if success:
         if total > 0:
             message = f":white_check_mark: Apex Events Scraper\nInserted: {total} results\nEvents: {event_names}"
         else:
             message = f":white_check_mark: Apex Events Scraper\nNo new events to process"
+        if record_updates:
+            updates_text = '\n'.join(record_updates[:10])  # Show first 10 differences
+            if len(record_updates) > 10:
+                updates_text += f"\n... and {len(record_updates) - 10} more"
+            message += f"\n\nRecord differences:\n{updates_text}"
         color = "good"
     else:
         message = ":x: Apex Events Scraper\nStatus: Failed"
+        if result.get('pending_events'):
+            message += f"\nInserted: {total} results\nIncomplete events: {', '.join(result['pending_events'])}"
         color = "danger"
     
     payload = {
@@ -550,10 +1087,20 @@ def send_slack_notification(result: Dict, success: bool = True):
         logger.error(f"Failed to send Slack notification: {e}")
 
 
+def parse_workers(value: str) -> Dict[str, int]:
+    """Parse --workers, e.g. 'fetch=2,write=2'"""
+    workers = {}
+    for part in filter(None, value.split(',')):
+        stage, _, count = part.partition('=')
+        if stage not in ('fetch', 'parse', 'write') or not count.isdigit() or int(count) < 1:
+            raise argparse.ArgumentTypeError(f"expected fetch=N, parse=N or write=N, got '{part}'")
+        workers[stage] = int(count)
+    return workers
+
+
 def main():
     """Main entry point"""
-    # Load environment variables from .env file
-    load_dotenv()
+    load_env()
     
     parser = argparse.ArgumentParser(
         description='Scrape Apex Athlete event results and insert into Supabase',
@@ -568,11 +1115,34 @@ Examples:
   
   # Dry run with short flag
   python scrape_apex_results.py -d
+  
+  # Dry run streaming one JSON object per result, e.g. into jq or a diff
+  python scrape_apex_results.py --dry-run --output jsonl > results.jsonl
+  
+  # Long-running mode: poll every 2 minutes and insert new events as they appear
+  python scrape_apex_results.py --watch --interval 120
+  
+  # Summarise each new event's score distributions into apex_event_stats
+  python scrape_apex_results.py --event-stats
+  
+  # Rebuild the athlete search index table and a versioned static copy of it
+  python scrape_apex_results.py --search-index --search-artifact public/search
+  
+  # Overlap fetching and inserting with two writer threads
+  python scrape_apex_results.py --workers fetch=1,parse=1,write=2
+  
+  # Keep derived records between runs to cross-check against record holders
+  python scrape_apex_results.py --record-state derived_records.json
+  
+  # Finish events a failed insert left partly stored on the next run
+  python scrape_apex_results.py --pending-state pending_events.json
 
 Environment Variables Required (except in dry-run mode):
   SUPABASE_URL - Your Supabase project URL
   SUPABASE_KEY - Your Supabase service role key
   SLACK_WEBHOOK_URL - Slack webhook for notifications (optional)
+  SUPABASE_DB_URL - Postgres connection string, only for --sink postgres
+  SUPABASE_GZIP_REQUESTS - Set to 1 to gzip large POST bodies (same as --gzip-requests)
   
   You can set these in a .env file in the scripts/ directory:
     SUPABASE_URL=https://xxxxx.supabase.co
@@ -587,14 +1157,125 @@ Environment Variables Required (except in dry-run mode):
         help='Run in dry-run mode: scrape and display results without inserting into database'
     )
     
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and poll the site for changes instead of scraping once'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=positive_int,
+        default=300,
+        help='Seconds between polls in watch mode (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--record-state',
+        metavar='PATH',
+        help='JSON file holding records derived from previous runs, updated after each run; '
+             'seeded once from apex_event_results when missing'
+    )
+    
+    parser.add_argument(
+        '--pending-state',
+        metavar='PATH',
+        help='JSON file listing events a failed insert left partly stored, retried by the next run'
+    )
+    
+    parser.add_argument(
+        '--percentiles',
+        action='store_true',
+        help='Compute per-gender percentile ranks for new results and write them to apex_result_percentiles'
+    )
+    
+    parser.add_argument(
+        '--event-stats',
+        action='store_true',
+        help='Keep running score statistics per event, gender and metric and write them to apex_event_stats'
+    )
+    
+    parser.add_argument(
+        '--search-index',
+        action='store_true',
+        help='Rebuild the athlete name prefix/trigram index and write changed terms to apex_athlete_search'
+    )
+    
+    parser.add_argument(
+        '--search-artifact',
+        metavar='DIR',
+        help='Also write the search index as a versioned JSON file plus manifest into DIR'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=parse_workers,
+        default={},
+        metavar='STAGE=N,...',
+        help='Worker threads per pipeline stage: fetch, parse, write (default: 1 each)'
+    )
+    
+    parser.add_argument(
+        '--quarantine',
+        metavar='PATH',
+        default='quarantined_athletes.jsonl',
+        help='JSON Lines file that malformed athlete records are appended to (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--sink',
+        choices=['postgrest', 'postgres'],
+        default='postgrest',
+        help='Write through the Supabase REST API, or COPY straight into Postgres via SUPABASE_DB_URL'
+    )
+    
+    parser.add_argument(
+        '--dead-letter',
+        metavar='PATH',
+        default='dead_letter_rows.jsonl',
+        help='JSON Lines file that rows rejected by the database are appended to (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--gzip-requests',
+        action='store_true',
+        default=os.environ.get('SUPABASE_GZIP_REQUESTS') == '1',
+        help='Gzip-encode large POST bodies sent to Supabase (the endpoint must accept Content-Encoding: gzip)'
+    )
+    
+    parser.add_argument(
+        '--output', '-o',
+        choices=OUTPUT_FORMATS,
+        default='pretty',
+        help='Dry-run output format: pretty table, or jsonl/csv rows streamed to stdout as they are parsed'
+    )
+    
     args = parser.parse_args()
     
     result = None
+    scraper = None
     try:
         # Run scraper
-        scraper = ApexResultsScraper(dry_run=args.dry_run)
+        scraper = ApexResultsScraper(dry_run=args.dry_run, record_state=args.record_state,
+                                     percentiles=args.percentiles, output=args.output,
+                                     gzip_requests=args.gzip_requests, quarantine_path=args.quarantine,
+                                     sink=args.sink, dead_letter_path=args.dead_letter,
+                                     event_stats=args.event_stats, search_index=args.search_index,
+                                     search_artifact_dir=args.search_artifact, workers=args.workers,
+                                     pending_state=args.pending_state)
+        if args.watch:
+            # Runs until interrupted; each pass that inserts results notifies on its own
+            scraper.watch(args.interval, notify=None if args.dry_run else send_slack_notification)
+            return 0
+        
         result = scraper.run()
         
+        if result.get('pending_events'):
+            # Partly stored events must not look like a clean run, even if the state file is lost
+            logger.error(f"Events not fully stored: {', '.join(result['pending_events'])}")
+            send_slack_notification(result, success=False)
+            return 1
+        
         # Send Slack notification (only in live mode)
         if not args.dry_run:
             send_slack_notification(result, success=True)
@@ -610,6 +1291,10 @@ Environment Variables Required (except in dry-run mode):
             send_slack_notification(result or {}, success=False)
         
         return 1
+    
+    finally:
+        if scraper is not None:
+            scraper.close()
 
 
 if __name__ == "__main__":
@@ -25,9 +25,16 @@ import json
 import re
 from datetime import datetime
 from typing import List, Dict, Optional
-import requests
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
+
+from batch_isolation import BatchInsertError, DeadLetterFile, insert_isolating, request_error
+from cli_support import load_env, positive_int
+from conditional_fetch import ConditionalFetcher
+from lazy_imports import lazy_import
+from http_compression import ACCEPT_ENCODING, encode_json_body, log_transfer
+from postgres_sink import PostgresSink
+from row_output import OUTPUT_FORMATS, make_row_writer
+
+requests = lazy_import('requests')
 
 # Configure logging
 logging.basicConfig(
@@ -43,17 +50,30 @@ class ApexRecordHoldersScraper:
     BASE_URL = "https://apexathleteofficial.com"
     IFRAME_URL = f"{BASE_URL}/apex_pages/apex_record_holders_page/index.html"
     TABLE_NAME = "apex_record_holders"
+    RECORD_COLUMNS = ['category', 'event_name', 'gender', 'record_holder', 'record_value', 'instagram_handle', 'last_updated']
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, output: str = 'pretty', gzip_requests: bool = False,
+                 sink: str = 'postgrest', dead_letter_path: Optional[str] = 'dead_letter_rows.jsonl'):
         """Initialize scraper with Supabase connection"""
         self.dry_run = dry_run
+        self.dead_letter = DeadLetterFile(dead_letter_path)
+        self.last_error = None
+        # Writes go through PostgREST unless a direct database connection is requested
+        self.pg_sink = PostgresSink(os.environ.get('SUPABASE_DB_URL')) if sink == 'postgres' and not dry_run else None
+        self.gzip_requests = gzip_requests
+        # Machine-readable output streams rows in dry run instead of pretty printing them
+        self.row_writer = make_row_writer(output, self.RECORD_COLUMNS) if dry_run else None
         self.supabase_url = os.environ.get('SUPABASE_URL')
         self.supabase_key = os.environ.get('SUPABASE_KEY')
         
         if not dry_run and (not self.supabase_url or not self.supabase_key):
             raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables must be set")
         
+        # Site connection and last-seen page survive between watch passes
+        self.fetcher = ConditionalFetcher()
+        
         self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
         if not dry_run:
             self.session.headers.update({
                 'apikey': self.supabase_key,
@@ -65,11 +85,8 @@ class ApexRecordHoldersScraper:
         for attempt in range(retries):
             try:
                 logger.info(f"Fetching: {url} (attempt {attempt + 1}/{retries})")
-                response = requests.get(url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                }, timeout=30)
-                response.raise_for_status()
-                return response.text
+                html, _ = self.fetcher.get_text(url)
+                return html
             except requests.RequestException as e:
                 logger.error(f"Error fetching {url}: {e}")
                 if attempt < retries - 1:
@@ -82,26 +99,43 @@ class ApexRecordHoldersScraper:
     def supabase_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Optional[Dict]:
         """Make a request to Supabase REST API"""
         url = f"{self.supabase_url}/rest/v1/{endpoint}"
+        self.last_error = None
         
         try:
             if method.upper() == 'GET':
                 response = self.session.get(url, params=params)
             elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, headers={'Prefer': 'return=representation'})
+                try:
+                    body, headers = encode_json_body(data, compress=self.gzip_requests)
+                except ValueError as e:
+                    raise requests.exceptions.InvalidJSONError(e) from e
+                headers['Prefer'] = 'return=representation'
+                response = self.session.post(url, data=body, headers=headers)
             elif method.upper() == 'DELETE':
                 response = self.session.delete(url, params=params)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
             response.raise_for_status()
+            log_transfer(response, f"Supabase {method.upper()} {endpoint}")
             return response.json() if response.text else None
             
         except requests.RequestException as e:
             logger.error(f"Supabase request failed: {e}")
             if hasattr(e.response, 'text'):
                 logger.error(f"Response: {e.response.text}")
+            self.last_error = request_error(e)
             return None
     
+    def _post_rows(self, rows: List[Dict]):
+        """POST rows to the table, returning (inserted rows, error)"""
+        response = self.supabase_request('POST', self.TABLE_NAME, data=rows)
+        if self.last_error is not None:
+            return None, self.last_error
+        if response is None:
+            return [], None
+        return (response if isinstance(response, list) else [response]), None
+    
     def clear_existing_records(self) -> bool:
         """Clear all existing records from the table"""
         if self.dry_run:
@@ -123,7 +157,15 @@ class ApexRecordHoldersScraper:
             self._print_dry_run_records(records)
             return len(records)
         
-        response = self.supabase_request('POST', self.TABLE_NAME, data=records)
+        try:
+            response, requests_made = insert_isolating(self._post_rows, records, self.TABLE_NAME, self.dead_letter)
+        except BatchInsertError as e:
+            logger.error(f"Failed to insert records: {e}")
+            response, requests_made = e.inserted, e.requests_made
+        
+        if requests_made > 1:
+            logger.warning(f"Isolated rejected rows in {requests_made} requests; "
+                           f"{self.dead_letter.count} row(s) in dead-letter file so far")
         
         if response:
             inserted = len(response) if isinstance(response, list) else 1
@@ -165,65 +207,56 @@ class ApexRecordHoldersScraper:
     
     def scrape_records(self) -> List[Dict]:
         """Scrape record holders from the iframe page"""
+        db_records = list(self.iter_records())
+        
+        logger.info(f"Scraped {len(db_records)} record holder entries")
+        
+        # Log record details for GitHub Actions to parse
+        record_details = [self._format_record_detail(record) for record in db_records]
+        if record_details:
+            logger.info(f"RECORD_DETAILS: {' | '.join(record_details)}")
+        
+        return db_records
+    
+    def iter_records(self):
+        """Yield record holder entries from the iframe page one at a time"""
         logger.info("Scraping record holders")
         
         # Fetch the iframe HTML
         html_content = self.fetch_page(self.IFRAME_URL)
         if not html_content:
             logger.error("Failed to fetch record holders iframe")
-            return []
+            return
         
         # Extract the RECORDS array from JavaScript
         records_data = self._extract_records_from_html(html_content)
         if not records_data:
             logger.error("Failed to extract records from HTML")
-            return []
+            return
         
         # Parse into database format
-        db_records = []
-        record_details = []  # For logging
-        
         for record in records_data:
             # Capitalize category (speed -> Speed, power -> Power, etc.)
             category = record.get('cat', '').capitalize()
             # Title case event name (FAST FORTY -> Fast Forty, THE PULL -> The Pull)
             event_name = record.get('title', '').title()
             
-            # Men's record
-            men_data = record.get('men', {})
-            if men_data and men_data.get('name'):
-                db_records.append({
-                    'category': category,
-                    'event_name': event_name,
-                    'gender': 'Men',
-                    'record_holder': men_data.get('name', ''),
-                    'record_value': men_data.get('value', ''),
-                    'instagram_handle': men_data.get('ig', '') if men_data.get('ig') != '—' else None,
-                    'last_updated': datetime.now().strftime('%Y-%m-%d')
-                })
-                record_details.append(f"{event_name} (M): {men_data.get('name', '')} - {men_data.get('value', '')}")
-            
-            # Women's record
-            women_data = record.get('women', {})
-            if women_data and women_data.get('name'):
-                db_records.append({
-                    'category': category,
-                    'event_name': event_name,
-                    'gender': 'Women',
-                    'record_holder': women_data.get('name', ''),
-                    'record_value': women_data.get('value', ''),
-                    'instagram_handle': women_data.get('ig', '') if women_data.get('ig') != '—' else None,
-                    'last_updated': datetime.now().strftime('%Y-%m-%d')
-                })
-                record_details.append(f"{event_name} (W): {women_data.get('name', '')} - {women_data.get('value', '')}")
-        
-        logger.info(f"Scraped {len(db_records)} record holder entries")
-        
-        # Log record details for GitHub Actions to parse
-        if record_details:
-            logger.info(f"RECORD_DETAILS: {' | '.join(record_details)}")
-        
-        return db_records
+            for gender, key in (('Men', 'men'), ('Women', 'women')):
+                holder = record.get(key, {})
+                if holder and holder.get('name'):
+                    yield {
+                        'category': category,
+                        'event_name': event_name,
+                        'gender': gender,
+                        'record_holder': holder.get('name', ''),
+                        'record_value': holder.get('value', ''),
+                        'instagram_handle': holder.get('ig', '') if holder.get('ig') != '—' else None,
+                        'last_updated': datetime.now().strftime('%Y-%m-%d')
+                    }
+    
+    def _format_record_detail(self, record: Dict) -> str:
+        """Format a record entry as 'Event (M): Holder - Value'"""
+        return f"{record['event_name']} ({record['gender'][0]}): {record['record_holder']} - {record['record_value']}"
     
     def _extract_records_from_html(self, html_content: str) -> Optional[List[Dict]]:
         """Extract RECORDS array from HTML"""
@@ -241,11 +274,19 @@ class ApexRecordHoldersScraper:
             logger.error(f"Failed to parse RECORDS JSON: {e}")
             return None
     
+    def close(self):
+        """Release the direct database connection, if one was opened"""
+        if self.pg_sink is not None:
+            self.pg_sink.close()
+    
     def run(self):
         """Main scraping workflow"""
         mode = "DRY RUN MODE" if self.dry_run else "LIVE MODE"
         logger.info(f"Starting Apex Record Holders Scraper - {mode}")
         
+        if self.row_writer is not None:
+            return self._stream_records()
+        
         if self.dry_run:
             print("\n" + "🔍 "*20)
             print("DRY RUN MODE ENABLED - No data will be inserted into the database")
@@ -259,16 +300,21 @@ class ApexRecordHoldersScraper:
             return {'total_records': 0, 'record_details': []}
         
         # Extract record details for notification
-        record_details = []
-        for record in records:
-            detail = f"{record['event_name']} ({record['gender'][0]}): {record['record_holder']} - {record['record_value']}"
-            record_details.append(detail)
+        record_details = [self._format_record_detail(record) for record in records]
         
-        # Clear existing records and insert new ones
-        if not self.dry_run:
-            self.clear_existing_records()
-        
-        inserted = self.insert_records(records)
+        if self.pg_sink is not None:
+            # Delete and reload in one transaction, so the table is never empty
+            inserted = self.pg_sink.replace_rows(self.TABLE_NAME, self.RECORD_COLUMNS, records, self.dead_letter)
+        else:
+            # Clear existing records and insert new ones
+            if not self.dry_run:
+                self.clear_existing_records()
+            
+            dead_lettered = self.dead_letter.count
+            inserted = self.insert_records(records)
+            if inserted + self.dead_letter.count - dead_lettered < len(records):
+                # The table was cleared, so a failed insert must not wait for the page to change
+                raise RuntimeError(f"Inserted only {inserted} of {len(records)} records after clearing the table")
         
         if self.dry_run:
             print(f"\n✅ Dry run complete. Would have inserted {inserted} record holder entries.")
@@ -276,6 +322,56 @@ class ApexRecordHoldersScraper:
         else:
             logger.info(f"Scraping complete. Total records inserted: {inserted}")
             return {'total_records': inserted, 'record_details': record_details}
+    
+    def watch(self, interval: int, notify=None):
+        """Poll the record holders page and replace records only when it changes
+        
+        The first pass behaves like a normal run; after that each idle poll is
+        a single conditional GET of the iframe. A pass that fails, including
+        an insert that failed after the table was cleared, is retried on the
+        next tick whether or not the page changed.
+        """
+        import time
+        
+        logger.info(f"Watching {self.IFRAME_URL} every {interval}s")
+        # The first pass always runs, and so does the one after a failed replace
+        retry = True
+        
+        try:
+            while True:
+                try:
+                    changed = retry
+                    if not retry:
+                        _, changed = self.fetcher.get(self.IFRAME_URL)
+                    
+                    if changed:
+                        retry = True
+                        # run() re-fetches the page, which is now a cheap 304
+                        result = self.run()
+                        retry = False
+                        if notify:
+                            notify(result, success=True)
+                    else:
+                        logger.debug("Record holders page unchanged")
+                except Exception as e:
+                    logger.error(f"Watch pass failed: {e}", exc_info=True)
+                    if notify:
+                        notify({}, success=False)
+                
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logger.info("Watch stopped")
+    
+    def _stream_records(self):
+        """Dry run that writes each record entry to the row writer as it is parsed"""
+        record_details = []
+        for record in self.iter_records():
+            self.row_writer.write(record)
+            record_details.append(self._format_record_detail(record))
+        self.row_writer.close()
+        
+        logger.info(f"Dry run complete. Streamed {len(record_details)} record holder entries.")
+        return {'total_records': len(record_details), 'record_details': record_details}
 
 
 def send_slack_notification(result: Dict, success: bool = True):
@@ -318,8 +414,7 @@ def send_slack_notification(result: Dict, success: bool = True):
 
 def main():
     """Main entry point"""
-    # Load environment variables from .env file
-    load_dotenv()
+    load_env()
     
     parser = argparse.ArgumentParser(
         description='Scrape Apex Athlete record holders and insert into Supabase',
@@ -334,11 +429,19 @@ Examples:
   
   # Dry run with short flag
   python scrape_record_holders.py -d
+  
+  # Long-running mode: poll every 5 minutes and replace records when the page changes
+  python scrape_record_holders.py --watch
+  
+  # Dry run streaming records as CSV
+  python scrape_record_holders.py --dry-run --output csv > records.csv
 
 Environment Variables Required (except in dry-run mode):
   SUPABASE_URL - Your Supabase project URL
   SUPABASE_KEY - Your Supabase service role key
   SLACK_WEBHOOK_URL - Slack webhook for notifications (optional)
+  SUPABASE_DB_URL - Postgres connection string, only for --sink postgres
+  SUPABASE_GZIP_REQUESTS - Set to 1 to gzip large POST bodies (same as --gzip-requests)
   
   You can set these in a .env file in the scripts/ directory:
     SUPABASE_URL=https://xxxxx.supabase.co
@@ -353,12 +456,62 @@ Environment Variables Required (except in dry-run mode):
         help='Run in dry-run mode: scrape and display records without inserting into database'
     )
     
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and poll the record holders page for changes instead of scraping once'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=positive_int,
+        default=300,
+        help='Seconds between polls in watch mode (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--sink',
+        choices=['postgrest', 'postgres'],
+        default='postgrest',
+        help='Write through the Supabase REST API, or COPY straight into Postgres via SUPABASE_DB_URL'
+    )
+    
+    parser.add_argument(
+        '--dead-letter',
+        metavar='PATH',
+        default='dead_letter_rows.jsonl',
+        help='JSON Lines file that rows rejected by the database are appended to (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--gzip-requests',
+        action='store_true',
+        default=os.environ.get('SUPABASE_GZIP_REQUESTS') == '1',
+        help='Gzip-encode large POST bodies sent to Supabase (the endpoint must accept Content-Encoding: gzip)'
+    )
+    
+    parser.add_argument(
+        '--output', '-o',
+        choices=OUTPUT_FORMATS,
+        default='pretty',
+        help='Dry-run output format: pretty listing, or jsonl/csv rows streamed to stdout as they are parsed'
+    )
+    
     args = parser.parse_args()
     
     result = None
+    scraper = None
     try:
         # Run scraper
-        scraper = ApexRecordHoldersScraper(dry_run=args.dry_run)
+        scraper = ApexRecordHoldersScraper(dry_run=args.dry_run, output=args.output,
+                                           gzip_requests=args.gzip_requests, sink=args.sink,
+                                           dead_letter_path=args.dead_letter)
+        
+        if args.watch:
+            # Runs until interrupted; each pass that replaces records notifies on its own
+            scraper.watch(args.interval, notify=None if args.dry_run else send_slack_notification)
+            return 0
+        
         result = scraper.run()
         
         # Send Slack notification (only in live mode)
@@ -376,6 +529,10 @@ Environment Variables Required (except in dry-run mode):
             send_slack_notification(result or {}, success=False)
         
         return 1
+    
+    finally:
+        if scraper is not None:
+            scraper.close()
 
 
 if __name__ == "__main__":
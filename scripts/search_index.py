@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete search index
+Prebuilt name prefixes and trigrams for search-as-you-type
+
+An athlete is a normalized name within a gender, represented by their best
+result: its row id (what the app navigates with), display name and apex
+score. Every athlete is filed under:
+
+- prefixes of each word and of the whole name ("zim", "justin z")
+- pg_trgm-style trigrams of each word, for typo-tolerant and mid-word matches
+
+Terms are published one row per (kind, gender, term), listing at most
+MAX_TERM_ATHLETES athletes best score first, so a keystroke is a single
+primary-key lookup:
+
+    create table apex_athlete_search (
+        id text primary key,           -- '{kind}:{gender}:{term}'
+        kind text not null,            -- 'prefix' or 'trigram'
+        gender text not null,
+        term text not null,
+        total integer not null,        -- athletes matching, before the cap
+        athletes jsonb not null,       -- [{"id", "athlete_name", "apex_score"}, ...]
+        digest text not null,
+        updated_at timestamptz default now()
+    );
+
+The same index can be written as a versioned JSON artifact for clients that
+would rather download it once and search locally.
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from datetime import datetime
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Prefixes longer than this are not indexed; clients filter the longest match by name
+MAX_PREFIX = 12
+# Short prefixes and the padded leading trigrams ('  j') match most athletes,
+# so every term row keeps only the best scorers
+MAX_TERM_ATHLETES = 50
+
+ARTIFACT_NAME = 'athlete_search_index'
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', stripped.lower()).split())
+
+
+def name_prefixes(normalized: str) -> Set[str]:
+    """Prefixes of the whole name and of each word, up to MAX_PREFIX characters"""
+    prefixes = set()
+    for text in [normalized] + normalized.split():
+        for length in range(1, min(len(text), MAX_PREFIX) + 1):
+            prefixes.add(text[:length])
+    return prefixes
+
+
+def name_trigrams(normalized: str) -> Set[str]:
+    """Trigrams of each word padded like pg_trgm ('  ab', ' abc', 'bc ')"""
+    trigrams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            trigrams.add(padded[i:i + 3])
+    return trigrams
+
+
+def _score_order(athlete: Dict) -> Tuple:
+    score = athlete.get('apex_score')
+    return (score is None, -(score or 0), athlete['athlete_name'])
+
+
+class SearchIndex:
+    """Best result per athlete and the prefix/trigram terms pointing at them"""
+
+    def __init__(self):
+        self.athletes: Dict[Tuple[str, str], Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.athletes)
+
+    def add_rows(self, rows: Iterable[Dict]):
+        """Offer apex_event_results rows; each athlete keeps their best-scoring one"""
+        for row in rows:
+            normalized = normalize_name(row.get('athlete_name'))
+            if not normalized:
+                continue
+            key = (row.get('gender'), normalized)
+            candidate = {
+                'id': row.get('id'),
+                'athlete_name': row.get('athlete_name'),
+                'apex_score': row.get('apex_score'),
+            }
+            current = self.athletes.get(key)
+            if current is None or _score_order(candidate) < _score_order(current):
+                self.athletes[key] = candidate
+
+    def _postings(self) -> Dict[Tuple[str, str, str], List[Dict]]:
+        """(kind, gender, term) -> athletes, best score first"""
+        postings: Dict[Tuple[str, str, str], List[Dict]] = {}
+        for (gender, normalized), athlete in self.athletes.items():
+            for kind, terms in (('prefix', name_prefixes(normalized)), ('trigram', name_trigrams(normalized))):
+                for term in terms:
+                    postings.setdefault((kind, gender, term), []).append(athlete)
+        for athletes in postings.values():
+            athletes.sort(key=_score_order)
+        return postings
+
+    def term_rows(self) -> List[Dict]:
+        """One apex_athlete_search row per (kind, gender, term)"""
+        rows = []
+        for (kind, gender, term), athletes in sorted(self._postings().items(), key=lambda item: tuple(map(str, item[0]))):
+            listed = athletes[:MAX_TERM_ATHLETES]
+            encoded = json.dumps(listed, sort_keys=True, separators=(',', ':'))
+            rows.append({
+                'id': f"{kind}:{gender}:{term}",
+                'kind': kind,
+                'gender': gender,
+                'term': term,
+                'total': len(athletes),
+                'athletes': listed,
+                'digest': hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16],
+            })
+        return rows
+
+    def changed_rows(self, published: Dict[str, str]) -> Tuple[List[Dict], List[str]]:
+        """Rows whose digest differs from published ({id: digest}), and published ids no longer present"""
+        rows = self.term_rows()
+        current = {row['id'] for row in rows}
+        changed = [row for row in rows if published.get(row['id']) != row['digest']]
+        stale = sorted(term_id for term_id in published if term_id not in current)
+        return changed, stale
+
+    def write_artifact(self, directory: str) -> str:
+        """Write the index as athlete_search_index.<version>.json plus a manifest; return its path
+
+        Athletes are listed once and terms refer to them by position, so the
+        file is a fraction of the table's size. The version is a content hash:
+        clients re-download only when the manifest's version changes.
+        """
+        athletes = sorted(self.athletes.items(), key=lambda item: (str(item[0][0]), _score_order(item[1])))
+        position = {key: i for i, (key, _) in enumerate(athletes)}
+        terms: Dict[str, Dict[str, List[int]]] = {'prefix': {}, 'trigram': {}}
+        for (gender, normalized), _ in athletes:
+            i = position[(gender, normalized)]
+            for term in name_prefixes(normalized):
+                terms['prefix'].setdefault(term, []).append(i)
+            for term in name_trigrams(normalized):
+                terms['trigram'].setdefault(term, []).append(i)
+
+        body = {
+            'athletes': [[a['id'], a['athlete_name'], gender, a['apex_score']] for (gender, _), a in athletes],
+            'prefix': dict(sorted(terms['prefix'].items())),
+            'trigram': dict(sorted(terms['trigram'].items())),
+        }
+        encoded = json.dumps(body, ensure_ascii=False, separators=(',', ':'))
+        version = hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:12]
+
+        os.makedirs(directory, exist_ok=True)
+        filename = f"{ARTIFACT_NAME}.{version}.json"
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(encoded)
+
+        manifest = {
+            'version': version,
+            'file': filename,
+            'athletes': len(athletes),
+            'max_prefix': MAX_PREFIX,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        # Replace the manifest atomically so readers never see a partial file
+        manifest_path = os.path.join(directory, f"{ARTIFACT_NAME}.json")
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_path + '.tmp', manifest_path)
+        return path
+
@@ -0,0 +1,101 @@
+-- Local test schema for the scrapers
+-- Mirrors the columns the scrapers write so the postgres sink, reconciliation
+-- and derived-table stages (percentiles, event stats, search index) can be
+-- exercised against a throwaway database.
+
+create table if not exists apex_event_results (
+    id bigint generated always as identity primary key,
+    event_name text not null,
+    date date not null,
+    athlete_rank integer,
+    athlete_name text not null,
+    apex_score numeric not null,
+    gender text not null,
+    speed_score numeric,
+    power_score numeric,
+    strength_score numeric,
+    endurance_score numeric,
+    fast_forty text,
+    max_toss text,
+    the_vertical text,
+    the_broad text,
+    the_push integer,
+    the_pull integer,
+    the_mile text,
+    instagram_handle text,
+    unique (event_name, gender, athlete_name)
+);
+
+create table if not exists apex_record_holders (
+    id bigint generated always as identity primary key,
+    category text not null,
+    event_name text not null,
+    gender text not null,
+    record_holder text not null,
+    record_value text not null,
+    instagram_handle text,
+    last_updated date
+);
+
+create table if not exists apex_result_percentiles (
+    result_id bigint primary key references apex_event_results(id) on delete cascade,
+    event_name text not null,
+    gender text not null,
+    apex_score_event_pct real,
+    apex_score_all_time_pct real,
+    speed_score_event_pct real,
+    speed_score_all_time_pct real,
+    power_score_event_pct real,
+    power_score_all_time_pct real,
+    strength_score_event_pct real,
+    strength_score_all_time_pct real,
+    endurance_score_event_pct real,
+    endurance_score_all_time_pct real,
+    fast_forty_event_pct real,
+    fast_forty_all_time_pct real,
+    max_toss_event_pct real,
+    max_toss_all_time_pct real,
+    the_vertical_event_pct real,
+    the_vertical_all_time_pct real,
+    the_broad_event_pct real,
+    the_broad_all_time_pct real,
+    the_push_event_pct real,
+    the_push_all_time_pct real,
+    the_pull_event_pct real,
+    the_pull_all_time_pct real,
+    the_mile_event_pct real,
+    the_mile_all_time_pct real,
+    updated_at timestamptz default now()
+);
+
+create table if not exists apex_event_stats (
+    event_name text not null,
+    gender text not null,
+    metric text not null,
+    count integer not null,
+    mean real,
+    stddev real,
+    min real,
+    max real,
+    p10 real,
+    p25 real,
+    p50 real,
+    p75 real,
+    p90 real,
+    bin_start real,
+    bin_width real,
+    histogram jsonb,
+    updated_at timestamptz default now(),
+    primary key (event_name, gender, metric)
+);
+
+create table if not exists apex_athlete_search (
+    id text primary key,
+    kind text not null,
+    gender text not null,
+    term text not null,
+    total integer not null,
+    athletes jsonb not null,
+    digest text not null,
+    updated_at timestamptz default now()
+);
@@ -0,0 +1,76 @@
+-- Derived tables for the results scraper's --percentiles, --event-stats and
+-- --search-index flags, plus the unique key its retried inserts rely on.
+-- Run once in the Supabase SQL editor before turning the flags on; every
+-- statement is safe to re-run.
+
+-- Retried events are re-posted with on_conflict=event_name,gender,athlete_name,
+-- which PostgREST can only resolve against a unique index on those columns.
+-- Remove duplicate rows first if this fails.
+create unique index if not exists apex_event_results_event_gender_athlete_key
+    on apex_event_results (event_name, gender, athlete_name);
+
+-- --percentiles: upserted on result_id
+create table if not exists apex_result_percentiles (
+    result_id bigint primary key references apex_event_results(id) on delete cascade,
+    event_name text not null,
+    gender text not null,
+    apex_score_event_pct real,
+    apex_score_all_time_pct real,
+    speed_score_event_pct real,
+    speed_score_all_time_pct real,
+    power_score_event_pct real,
+    power_score_all_time_pct real,
+    strength_score_event_pct real,
+    strength_score_all_time_pct real,
+    endurance_score_event_pct real,
+    endurance_score_all_time_pct real,
+    fast_forty_event_pct real,
+    fast_forty_all_time_pct real,
+    max_toss_event_pct real,
+    max_toss_all_time_pct real,
+    the_vertical_event_pct real,
+    the_vertical_all_time_pct real,
+    the_broad_event_pct real,
+    the_broad_all_time_pct real,
+    the_push_event_pct real,
+    the_push_all_time_pct real,
+    the_pull_event_pct real,
+    the_pull_all_time_pct real,
+    the_mile_event_pct real,
+    the_mile_all_time_pct real,
+    updated_at timestamptz default now()
+);
+
+-- --event-stats: upserted on (event_name, gender, metric)
+create table if not exists apex_event_stats (
+    event_name text not null,
+    gender text not null,
+    metric text not null,
+    count integer not null,
+    mean real,
+    stddev real,
+    min real,
+    max real,
+    p10 real,
+    p25 real,
+    p50 real,
+    p75 real,
+    p90 real,
+    bin_start real,
+    bin_width real,
+    histogram jsonb,
+    updated_at timestamptz default now(),
+    primary key (event_name, gender, metric)
+);
+
+-- --search-index: upserted on id, stale terms deleted by id
+create table if not exists apex_athlete_search (
+    id text primary key,
+    kind text not null,
+    gender text not null,
+    term text not null,
+    total integer not null,
+    athletes jsonb not null,
+    digest text not null,
+    updated_at timestamptz default now()
+);
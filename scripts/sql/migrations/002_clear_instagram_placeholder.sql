@@ -0,0 +1,7 @@
+-- Rows scraped before the decoder stored missing Instagram handles as null
+-- still hold the site's '@handle' placeholder. Clear them so the app and
+-- reconcile_results.py see one spelling of "no handle". Safe to re-run.
+
+update apex_event_results
+set instagram_handle = null
+where instagram_handle = '@handle';
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Apex Athlete stage pipeline
+Runs a sequence of stages in worker threads joined by bounded queues
+
+Each stage is a function from one item to the next stage's item (None drops
+the item). Stages run concurrently, so while event N is being written, event
+N+1 can be parsed and event N+2 fetched; a run takes about as long as its
+slowest stage instead of the sum of all of them.
+
+Queues between stages hold at most queue_size items. A fast upstream stage
+blocks once its output queue is full (backpressure), so a slow writer never
+lets fetched pages pile up in memory.
+
+Per-stage counters show where the time goes:
+
+- busy: seconds inside the stage function, summed over workers
+- starved: seconds waiting for input (the stage upstream is slower)
+- blocked: seconds waiting for room downstream (the stage downstream is slower)
+- utilisation: busy / (elapsed * workers); the bottleneck is the stage near 100%
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class Stage:
+    """One pipeline step, its worker count and its counters"""
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1):
+        if workers < 1:
+            raise ValueError(f"Stage {name} needs at least one worker")
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def _add(self, items: int = 0, busy: float = 0.0, starved: float = 0.0, blocked: float = 0.0):
+        with self._lock:
+            self.items += items
+            self.busy += busy
+            self.starved += starved
+            self.blocked += blocked
+
+    def utilisation(self, elapsed: float) -> float:
+        if elapsed <= 0:
+            return 0.0
+        return self.busy / (elapsed * self.workers)
+
+
+class StagePipeline:
+    """Bounded-queue pipeline over a list of stages"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 2):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.elapsed = 0.0
+        # Time the caller spent waiting to hand items to the first stage
+        self.feed_blocked = 0.0
+        self.error: Optional[BaseException] = None
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """Push items through every stage; return the last stage's outputs
+
+        If a stage raises, remaining items are drained without being
+        processed and the first exception is re-raised once all workers stop.
+        """
+        self.error = None
+        self.feed_blocked = 0.0
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        outputs: List[Any] = []
+        outputs_lock = threading.Lock()
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            stage._running = stage.workers
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(index, queues, outputs, outputs_lock),
+                    name=f"{stage.name}-{n}", daemon=True
+                )
+                threads.append(thread)
+
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+
+        for item in items:
+            if self.error is not None:
+                break
+            wait = time.monotonic()
+            queues[0].put(item)
+            self.feed_blocked += time.monotonic() - wait
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.monotonic() - start
+
+        if self.error is not None:
+            raise self.error
+        return outputs
+
+    def _work(self, index: int, queues: List[queue.Queue], outputs: List[Any], outputs_lock: threading.Lock):
+        stage = self.stages[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+
+        while True:
+            wait = time.monotonic()
+            item = inbox.get()
+            stage._add(starved=time.monotonic() - wait)
+            if item is _DONE:
+                break
+            if self.error is not None:
+                continue  # Drain so upstream workers never block on a full queue
+
+            began = time.monotonic()
+            try:
+                result = stage.fn(item)
+            except BaseException as e:
+                logger.error(f"Pipeline stage {stage.name} failed: {e}")
+                if self.error is None:
+                    self.error = e
+                result = None
+            stage._add(items=1, busy=time.monotonic() - began)
+
+            if result is None:
+                continue
+            if outbox is None:
+                with outputs_lock:
+                    outputs.append(result)
+            else:
+                wait = time.monotonic()
+                outbox.put(result)
+                stage._add(blocked=time.monotonic() - wait)
+
+        # The last worker of a stage tells every worker downstream to stop
+        with stage._lock:
+            stage._running -= 1
+            last = stage._running == 0
+        if last and outbox is not None:
+            for _ in range(self.stages[index + 1].workers):
+                outbox.put(_DONE)
+
+    def log_summary(self):
+        """Log each stage's counters and the likely bottleneck"""
+        for stage in self.stages:
+            logger.info(f"Stage {stage.name}: {stage.items} items, {stage.workers} worker(s), "
+                        f"busy {stage.busy:.1f}s, starved {stage.starved:.1f}s, blocked {stage.blocked:.1f}s, "
+                        f"utilisation {stage.utilisation(self.elapsed):.0%}")
+        bottleneck = max(self.stages, key=lambda s: s.utilisation(self.elapsed))
+        logger.info(f"Pipeline finished in {self.elapsed:.1f}s; busiest stage: {bottleneck.name}")